@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+from typing import Callable
+from pyuav.graphics.assets import ASSET_CACHE
+
+# Drone counts for which the physics clients are benchmarked
+DRONE_COUNTS = (1, 10, 100, 1000, 10000)
+
+# Bundled assets as (3D model, texture or diffuse color)
+ASSETS = {
+    'low_poly_drone.body': (os.path.join('assets', 'low_poly_drone', 'body.obj'), os.path.join('assets', 'low_poly_drone', 'diffuse.png')),
+    'low_poly_drone.rotor': (os.path.join('assets', 'low_poly_drone', 'rotor.obj'), '#333333'),
+    'cube': (os.path.join('assets', 'cube', 'cube.obj'), '#ff0000'),
+    'boeing-787': (os.path.join('assets', 'boeing-787', 'boeing-787.obj'), os.path.join('assets', 'boeing-787', 'textures', 'diffuse.png'))
+}
+
+# Frame sizes (width, height) at which rendering is benchmarked
+RESOLUTIONS = ((320, 240), (480, 320), (640, 480), (1280, 720))
+
+
+def measure(fn: Callable[[], None], repeats: int, warmup: int = 1, setup: Callable[[], None] = None) -> dict:
+    """Times repeated calls of `fn` (excluding `setup`, which is called before each call).
+
+    Returns:
+        dict: Number of calls and mean, median, min and max duration in seconds.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    times = np.empty(repeats, dtype=np.float64)
+    for i in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+
+    return dict(
+        repeats=repeats,
+        mean=float(times.mean()),
+        median=float(np.median(times)),
+        min=float(times.min()),
+        max=float(times.max())
+        )
+
+
+def bench_dynamics(backend: str, drone_counts: tuple[int], steps: int) -> dict:
+    """Times a single `control` step of all drones for increasing fleet sizes.
+    """
+    results = {}
+    for num_drones in drone_counts:
+        positions = np.random.uniform(-10, 10, size=(num_drones, 3)).astype(np.float32)
+        positions[:, 2] = np.abs(positions[:, 2]) + 1
+        rotations = np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (num_drones, 1))
+        targets = positions + np.random.uniform(-1, 1, size=positions.shape).astype(np.float32)
+        headings = np.zeros(num_drones, dtype=np.float32)
+
+        if backend == 'primitive':
+            from pyuav.dynamics.quadcopter_primitive import QuadcopterPhysicsClient
+            client = QuadcopterPhysicsClient(num_drones=num_drones, positions=positions, rotations=rotations)
+            step = lambda: client.control_all(targets=targets, headings=headings)
+        else:
+            from pyuav.dynamics.quadcopter_pyflyt import QuadcopterPhysicsClient
+            client = QuadcopterPhysicsClient(num_drones=num_drones, positions=positions, rotations=rotations)
+            step = lambda: client.control(targets=targets, headings=headings)
+
+        results[f'dynamics.{backend}.n={num_drones}'] = measure(step, repeats=steps)
+        del client
+    return results
+
+
+def bench_assets(repeats: int) -> dict:
+    """Times `Material` and `Mesh` construction of each bundled asset, both from an empty
+    in-memory asset cache (cold; binary assets are compiled beforehand) and with all assets cached (warm).
+    """
+    from pyuav.graphics.meshes import Mesh, Material, compile_asset, is_compiled
+
+    results = {}
+    for name, (model_file, material_arg) in ASSETS.items():
+        files = [f for f in (model_file, material_arg) if f.endswith(('.obj', '.png'))]
+        if not all(os.path.isfile(f) for f in files):
+            print(f"bench_assets() :: skipping '{name}' (asset files not found)")
+            continue
+
+        for file_path in files:
+            if not is_compiled(file_path):
+                compile_asset(file_path)
+
+        material = lambda: Material(material_arg) if material_arg.endswith('.png') else Material(diffuse=material_arg)
+        results[f'assets.{name}.material.cold'] = measure(material, repeats, setup=ASSET_CACHE.clear)
+        results[f'assets.{name}.material.warm'] = measure(material, repeats)
+        results[f'assets.{name}.mesh.cold'] = measure(lambda: Mesh(model_file, material()), repeats, setup=ASSET_CACHE.clear)
+        results[f'assets.{name}.mesh.warm'] = measure(lambda: Mesh(model_file, material()), repeats)
+    return results
+
+
+def select_cpu_adapter() -> str:
+    """Makes PyGFX render on a software (CPU) wgpu adapter such as llvmpipe or WARP. Must be called
+    before the first `Renderer` is created.
+
+    Returns:
+        str: Description of the selected adapter.
+    """
+    import wgpu
+    import pygfx as gfx
+
+    adapters = [a for a in wgpu.gpu.enumerate_adapters_sync() if a.info.get('adapter_type', '').lower() == 'cpu']
+    if not adapters:
+        raise RuntimeError('No software (CPU) wgpu adapter available')
+    gfx.renderers.wgpu.select_adapter(adapters[0])
+    return adapters[0].summary
+
+
+def bench_rendering(resolutions: tuple[tuple[int, int]], frames: int) -> dict:
+    """Times `Renderer.render` of a small scene (ground grid, lights and a quadcopter if its assets are found)
+    at several resolutions, with and without `return_buffer`.
+    """
+    from pyuav.graphics.lighting import AmbientLight, DirectionalLight
+    from pyuav.graphics.rendering import Scene, Grid, PerspectiveCamera, Renderer
+
+    scene = Scene(Grid(), AmbientLight(), DirectionalLight())
+    model_file, tex_file = ASSETS['low_poly_drone.body']
+    if os.path.isfile(model_file) and os.path.isfile(tex_file):
+        from pyuav.graphics.meshes import Mesh, Material
+        scene.add(Mesh(model_file, Material(tex_file), position=(0, 1, 0)))
+
+    camera = PerspectiveCamera(position=(5, 3, 5))
+    camera.set_lookat((0, 1, 0))
+
+    results = {}
+    for width, height in resolutions:
+        renderer = Renderer(width=width, height=height)
+        for return_buffer in (False, True):
+            stats = measure(lambda: renderer.render(scene, camera, return_buffer=return_buffer), repeats=frames, warmup=3)
+            stats['fps'] = 1.0 / stats['mean']
+            results[f'render.{width}x{height}.return_buffer={return_buffer}'] = stats
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compares median durations of all benchmarks present in both results and baseline.
+
+    Returns:
+        list[str]: Descriptions of benchmarks that are more than `tolerance` (fraction) slower than the baseline.
+    """
+    regressions = []
+    for name, stats in sorted(results['benchmarks'].items()):
+        if name not in baseline['benchmarks']:
+            continue
+
+        ratio = stats['median'] / baseline['benchmarks'][name]['median']
+        print(f'{name:<56} {1000 * stats["median"]:>10.3f}ms  x{ratio:.2f}')
+        if ratio > 1 + tolerance:
+            regressions.append(f'{name}: {ratio:.2f}x slower than baseline')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks pyUAV dynamics, asset loading and rendering.')
+    parser.add_argument('--suites', nargs='+', default=['primitive', 'pyflyt', 'assets', 'render'],
+                        choices=['primitive', 'pyflyt', 'assets', 'render'], help='Benchmarks to run.')
+    parser.add_argument('--max-drones', type=int, default=max(DRONE_COUNTS), help='Largest fleet size to benchmark.')
+    parser.add_argument('--repeats', type=int, default=20, help='Number of timed calls per benchmark.')
+    parser.add_argument('--adapter', default='cpu', choices=['cpu', 'default'], help='wgpu adapter used for rendering.')
+    parser.add_argument('--output', default='benchmark_results.json', help='File to write results to.')
+    parser.add_argument('--baseline', default=None, help='Results file to compare against.')
+    parser.add_argument('--save-baseline', action='store_true', help='Also write results to the --baseline file.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown relative to the baseline (fraction).')
+    args = parser.parse_args()
+
+    results = dict(
+        machine=dict(platform=platform.platform(), processor=platform.processor(), python=platform.python_version(), numpy=np.__version__),
+        benchmarks={}
+        )
+    drone_counts = tuple(n for n in DRONE_COUNTS if n <= args.max_drones)
+
+    for backend in ('primitive', 'pyflyt'):
+        if backend in args.suites:
+            try:
+                results['benchmarks'].update(bench_dynamics(backend, drone_counts, args.repeats))
+            except ImportError as e:
+                print(f"main() :: skipping '{backend}' benchmarks ({e})")
+
+    if 'assets' in args.suites:
+        results['benchmarks'].update(bench_assets(args.repeats))
+
+    if 'render' in args.suites:
+        if args.adapter == 'cpu':
+            results['machine']['adapter'] = select_cpu_adapter()
+        results['benchmarks'].update(bench_rendering(RESOLUTIONS, args.repeats))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'main() :: wrote {len(results["benchmarks"])} results to {args.output}')
+
+    if args.baseline is None:
+        return 0
+
+    if args.save_baseline or not os.path.isfile(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'main() :: saved baseline to {args.baseline}')
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
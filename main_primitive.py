@@ -4,6 +4,9 @@ from pyuav.entities import Quadcopter
 from pyuav.graphics.meshes import *
 from pyuav.graphics.lighting import *
 from pyuav.graphics.rendering import *
+from pyuav.simulation import Simulation
+from pyuav.collision import CollisionWorld
+from pyuav.sensors import Lidar
 
 
 quadcopter1 = Quadcopter(position=(15, 0, 15))
@@ -13,13 +16,19 @@ quadcopter2 = Quadcopter(position=(25, 3, 10))
 target_cube = Mesh(
     file_path="assets\\cube\\cube.obj",
     material=Material(diffuse="#ff0000"),
-    position=(10, 10, 10)
+    position=(10, 10, 10),
+    static=True
     )
 
 boeing = Mesh(
     file_path="assets\\boeing-787\\boeing-787.obj",
     material=Material("assets\\boeing-787\\textures\\diffuse.png"),
-    position=(0, 0, 0) # centered on the ground
+    lod_ratios=(0.25, 0.05),
+    lod_screen_sizes=(0.5, 0.15),
+    position=(0, 0, 0), # centered on the ground
+    static=True, # never moves; shadows are rendered once
+    cast_shadow=True,
+    receive_shadow=True
     )
 
 camera = PerspectiveCamera(position=(17, 9, 13))
@@ -33,12 +42,35 @@ scene = Scene(Grid(), ambient_light, direct_light, quadcopter1.body_and_rotors,
 # Render from drone's camera
 renderer = Renderer(height=320, width=480)
 
+# Step physics at 240 Hz while rendering at 30 Hz
+simulation = Simulation(scene, renderer, camera, physics_hz=240, render_hz=30, interpolate=True)
+simulation.add(quadcopter1, lambda t: (target_cube.get_position(), np.pi))
+simulation.add(quadcopter2, lambda t: (target_cube.get_position(), np.pi))
+
+# Detect drones hitting the (static) Boeing and each other
+collisions = CollisionWorld(drone_radius=0.35)
+collisions.add_static(boeing)
+
+# Ray-cast lidar (32 x 8 beams) against the same static geometry, without rendering
+lidar = Lidar(collisions, horizontal_beams=32, vertical_beams=8, max_range=30.0)
+
+# Collision and obstacle warnings are only printed when they start or end
+colliding, obstructed = False, False
+
 for _ in range(99999):
-    image = renderer.render(scene, camera, return_buffer=True)
+    image = simulation.step_frame()
+
+    positions = np.stack([quadcopter1.get_position(), quadcopter2.get_position()])
+    collision = bool(len(collisions.query_static(positions)[0]) or len(collisions.query_drones(positions)[0]))
+    if collision != colliding:
+        print('collision!' if collision else 'collision resolved')
+        colliding = collision
 
-    # Update state of quadcopter
-    quadcopter1.control(target=target_cube.get_position(), heading=np.pi)
-    quadcopter2.control(target=target_cube.get_position(), heading=np.pi)
+    ranges = quadcopter1.scan(lidar)
+    obstacle = bool(ranges.min() < 2.0)
+    if obstacle != obstructed:
+        print(f'obstacle at {ranges.min():.2f} m' if obstacle else 'obstacle cleared')
+        obstructed = obstacle
 
     # Always look at quadcopter 1
     camera.set_lookat(quadcopter1.get_position())
@@ -1,5 +1,4 @@
 import cv2
-import pylinalg as la
 from pyuav.graphics.meshes import *
 from pyuav.graphics.lighting import *
 from pyuav.graphics.rendering import *
@@ -52,7 +51,12 @@ rotor_rr = Mesh(
 boeing = Mesh(
     file_path="assets\\boeing-787\\boeing-787.obj",
     material=Material("assets\\boeing-787\\textures\\diffuse.png"),
-    position=BOEING_787_START_POS
+    lod_ratios=(0.25, 0.05),
+    lod_screen_sizes=(0.5, 0.15),
+    position=BOEING_787_START_POS,
+    static=True, # never moves; shadows are rendered once
+    cast_shadow=True,
+    receive_shadow=True
     )
     
 
@@ -71,7 +75,8 @@ target = np.array(QUADCOPTER_DEST_POS)
 target_cube = Mesh(
     file_path="assets\\cube\\cube.obj",
     material=Material(diffuse="#ff0000"),
-    position=target
+    position=target,
+    static=True
     )
 
 
@@ -79,38 +84,28 @@ target_cube = Mesh(
 scene = Scene(Grid(), ambient_light, direct_light, quadcopter, boeing, target_cube)
 
 
-def XZY_to_XYZ(a: np.ndarray) -> np.ndarray:
-    return np.array([a[0], a[2], a[1]], dtype=a.dtype)
-
-def XYZ_to_XZY(a: np.ndarray) -> np.ndarray:
-    return np.array([a[0], a[2], a[1]], dtype=a.dtype)
-
-def XYZ_to_XZY_quat(q: np.ndarray) -> np.ndarray:
-    q1 = np.array([-q[1], q[2], -q[0], q[3]], dtype=q.dtype) 
-    q2 = np.array([0, np.sin(-np.pi/4), 0, np.cos(-np.pi/4)], dtype=q.dtype) 
-    return la.quat_mul(q2, q1)
-
-
 # Add physics body to model drone
 physics_client = QuadcopterPhysicsClient(
-    positions=[XZY_to_XYZ(QUADCOPTER_START_POS)]
+    positions=[QUADCOPTER_START_POS],
+    y_up=True # convert to/from PyFlyt's Z-up frame
 )
 
 
 # Render from drone's camera
 renderer = Renderer(height=320, width=480)
+image = np.empty((320, 480, 3), dtype=np.uint8) # BGR frame reused every step
 
 for _ in range(99999):
-    image = renderer.render(scene, camera, return_buffer=True)
+    renderer.render(scene, camera, out=image, pixel_format='bgr')
 
     # Update state of quadcopter
-    positions, rotations = physics_client.control(targets=XZY_to_XYZ(target)[np.newaxis], headings=[np.pi])
+    positions, rotations = physics_client.control(targets=target[np.newaxis], headings=[np.pi])
 
-    quadcopter.set_position(XYZ_to_XZY(positions[0]))
-    quadcopter.set_rotation(XYZ_to_XZY_quat(rotations[0]))
+    quadcopter.set_position(positions[0])
+    quadcopter.set_rotation(rotations[0])
 
-    camera.set_lookat(XYZ_to_XZY(positions[0]))
+    camera.set_lookat(positions[0])
 
-    cv2.imshow("", cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    cv2.imshow("", image)
     cv2.waitKey(1)
     print('ok')
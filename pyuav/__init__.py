@@ -0,0 +1,26 @@
+import importlib
+from pyuav.backends import DYNAMICS, RENDERERS, BackendRegistry
+
+# Public classes, imported from their modules on first access so that `import pyuav` does not load any backend
+_LAZY_ATTRIBUTES = {
+    'Quadcopter': 'pyuav.entities',
+    'Swarm': 'pyuav.entities',
+    'Fleet': 'pyuav.fleet',
+    'Simulation': 'pyuav.simulation',
+    'QuadcopterVecEnv': 'pyuav.envs',
+    'CollisionWorld': 'pyuav.collision',
+    'Lidar': 'pyuav.sensors',
+    'Replay': 'pyuav.trajectory',
+    'TrajectoryWriter': 'pyuav.trajectory',
+    'PROFILER': 'pyuav.profiling',
+}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module 'pyuav' has no attribute '{name}'")
+    return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
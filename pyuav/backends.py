@@ -0,0 +1,55 @@
+import importlib
+from typing import Callable, Union
+
+
+class BackendRegistry:
+    """Registry of backends by name. Backends can be registered as 'module:attribute' paths,
+    which are only imported when the backend is first requested.
+    """
+    def __init__(self, kind: str) -> None:
+        self._kind = kind
+        self._factories = {}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._factories)
+
+    def register(self, name: str, factory: Union[Callable, str]) -> None:
+        """Registers (or replaces) a backend.
+
+        Args:
+            name (str):                 Name the backend is requested by.
+            factory (Callable | str):   Function or class creating the backend, or its 'module:attribute' path.
+        """
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Callable:
+        """Returns the factory of a backend, importing it on first use.
+        """
+        if name not in self._factories:
+            choices = ', '.join(f"'{n}'" for n in self._factories)
+            raise Exception(f"{self._kind} backend '{name}' not understood. Choose from {choices}.")
+
+        factory = self._factories[name]
+        if isinstance(factory, str):
+            module, attribute = factory.split(':')
+            factory = getattr(importlib.import_module(module), attribute)
+            self._factories[name] = factory
+        return factory
+
+    def create(self, name: str, *args, **kwargs) -> object:
+        return self.get(name)(*args, **kwargs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+
+# Dynamics backends create a physics client from `(num_drones, positions, rotations, seed)` working in the renderer's
+# Y-up frame, with `control_all(targets, headings, dt) -> (positions, rotations)`
+DYNAMICS = BackendRegistry('dynamics')
+DYNAMICS.register('primitive', 'pyuav.dynamics.quadcopter_primitive:QuadcopterPhysicsClient')
+DYNAMICS.register('pyflyt', 'pyuav.dynamics.quadcopter_pyflyt:create_client')
+
+# Renderer backends create a renderer from `(width, height)`
+RENDERERS = BackendRegistry('renderer')
+RENDERERS.register('pygfx', 'pyuav.graphics.rendering:Renderer')
@@ -0,0 +1,379 @@
+import itertools
+import numpy as np
+from typing import Union
+from pyuav.profiling import LOGGER, PROFILER
+
+# Neighbouring cells (including the cell itself) whose first non-zero offset is positive, so that
+# each pair of neighbouring cells is visited exactly once
+_HALF_NEIGHBOURS = np.array([
+    offset for offset in itertools.product((-1, 0, 1), repeat=3)
+    if offset == (0, 0, 0) or next(o for o in offset if o != 0) > 0
+], dtype=np.int64)
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum('ij,ij->i', a, b)
+
+
+def closest_points_on_triangles(p: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Batched closest point to points p on triangles (a, b, c), all of shape (N, 3), by testing
+    in which Voronoi region of the triangle each point lies (Ericson, Real-Time Collision Detection, 5.1.5).
+    """
+    ab, ac = b - a, c - a
+    ap, bp, cp = p - a, p - b, p - c
+    d1, d2 = _dot(ab, ap), _dot(ac, ap)
+    d3, d4 = _dot(ab, bp), _dot(ac, bp)
+    d5, d6 = _dot(ab, cp), _dot(ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Interior of face, overwritten by edges and vertices (in increasing order of precedence)
+        denom = va + vb + vc
+        denom[denom == 0] = 1
+        result = a + ab * (vb / denom)[:, None] + ac * (vc / denom)[:, None]
+
+        regions = [
+            ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0), lambda: b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))[:, None]),
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0), lambda: a + ac * (d2 / (d2 - d6))[:, None]),
+            ((d6 >= 0) & (d5 <= d6), lambda: c),
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0), lambda: a + ab * (d1 / (d1 - d3))[:, None]),
+            ((d3 >= 0) & (d4 <= d3), lambda: b),
+            ((d1 <= 0) & (d2 <= 0), lambda: a)
+        ]
+        for mask, point in regions:
+            if mask.any():
+                result[mask] = point()[mask]
+    return np.nan_to_num(result)
+
+
+def intersect_triangles(origins: np.ndarray, directions: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Batched ray-triangle intersection (Moller-Trumbore) of rays (origins, directions) with triangles (a, b, c),
+    all of shape (N, 3).
+
+    Returns:
+        np.ndarray: Distances along the rays (in units of the direction length) of shape (N,); inf if missed.
+    """
+    e1, e2 = b - a, c - a
+    p = np.cross(directions, e2)
+    det = _dot(e1, p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_det = 1 / det
+        s = origins - a
+        u = _dot(s, p) * inv_det
+        q = np.cross(s, e1)
+        v = _dot(directions, q) * inv_det
+        t = _dot(e2, q) * inv_det
+        hit = (np.abs(det) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return np.where(hit, t, np.inf)
+
+
+class TriangleBVH:
+    def __init__(self, vertices: np.ndarray, triangles: np.ndarray, leaf_size: int = 8) -> None:
+        """Bounding-volume hierarchy of axis-aligned boxes over a static triangle mesh, built by splitting
+        triangles at the median centroid along the longest axis of each box.
+
+        Args:
+            vertices (np.ndarray):  Vertex positions of shape (V, 3).
+            triangles (np.ndarray): Vertex indices of shape (T, 3).
+            leaf_size (int):        Maximum number of triangles per leaf.
+        """
+        self._corners = np.asarray(vertices, dtype=np.float32)[np.asarray(triangles, dtype=np.int64).reshape(-1, 3)]
+        tri_min, tri_max = self._corners.min(axis=1), self._corners.max(axis=1)
+        centroids = (tri_min + tri_max) / 2
+
+        # Nodes as flat arrays; leaves have left == -1 and hold triangles order[start:start + count]
+        self._order = np.arange(len(self._corners))
+        node_min, node_max, left, right, start, count = [], [], [], [], [], []
+
+        stack = [(0, len(self._order), -1, False)]
+        while stack:
+            lo, hi, parent, is_right = stack.pop()
+            node = len(node_min)
+            if parent >= 0:
+                (right if is_right else left)[parent] = node
+
+            tris = self._order[lo:hi]
+            node_min.append(tri_min[tris].min(axis=0))
+            node_max.append(tri_max[tris].max(axis=0))
+            left.append(-1)
+            right.append(-1)
+            start.append(lo)
+            count.append(hi - lo)
+
+            if hi - lo > leaf_size:
+                axis = np.argmax(node_max[-1] - node_min[-1])
+                mid = (hi - lo) // 2
+                self._order[lo:hi] = tris[np.argpartition(centroids[tris, axis], mid)]
+                stack.append((lo + mid, hi, node, True))
+                stack.append((lo, lo + mid, node, False))
+
+        self._node_min = np.array(node_min, dtype=np.float32).reshape(-1, 3)
+        self._node_max = np.array(node_max, dtype=np.float32).reshape(-1, 3)
+        self._left = np.array(left, dtype=np.int64)
+        self._right = np.array(right, dtype=np.int64)
+        self._start = np.array(start, dtype=np.int64)
+        self._count = np.array(count, dtype=np.int64)
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self._corners)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._node_min)
+
+    def query_spheres(self, centers: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the closest point of the mesh within `radius` of each sphere center, traversing the hierarchy
+        for all spheres at once.
+
+        Args:
+            centers (np.ndarray): Sphere centers of shape (N, 3).
+            radius (float):       Sphere radius.
+
+        Returns:
+            tuple: Indices of intersecting spheres (K,), closest triangles (K,), closest points (K, 3) and distances (K,).
+        """
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+        queries = np.arange(len(centers))
+        nodes = np.zeros(len(centers), dtype=np.int64)
+        cand_queries, cand_triangles = [], []
+
+        while len(queries):
+            # Discard boxes out of reach of their sphere
+            c = centers[queries]
+            gap = np.maximum(self._node_min[nodes] - c, 0) + np.maximum(c - self._node_max[nodes], 0)
+            hit = _dot(gap, gap) <= radius * radius
+            queries, nodes = queries[hit], nodes[hit]
+
+            # Leaves produce candidate triangles; inner nodes are replaced by their children
+            leaf = self._left[nodes] < 0
+            counts = self._count[nodes[leaf]]
+            if len(counts):
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                cand_queries.append(np.repeat(queries[leaf], counts))
+                cand_triangles.append(self._order[np.repeat(self._start[nodes[leaf]], counts) + offsets])
+
+            inner = ~leaf
+            queries = np.concatenate([queries[inner], queries[inner]])
+            nodes = np.concatenate([self._left[nodes[inner]], self._right[nodes[inner]]])
+
+        if not cand_queries:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros((0, 3), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        queries, triangles = np.concatenate(cand_queries), np.concatenate(cand_triangles)
+        corners = self._corners[triangles]
+        points = closest_points_on_triangles(centers[queries], corners[:, 0], corners[:, 1], corners[:, 2])
+        distances = np.linalg.norm(centers[queries] - points, axis=-1)
+
+        # Keep the closest triangle within reach of each sphere
+        order = np.lexsort((distances, queries))
+        queries, triangles, points, distances = queries[order], triangles[order], points[order], distances[order]
+        first = np.flatnonzero(np.r_[True, queries[1:] != queries[:-1]])
+        keep = first[distances[first] <= radius]
+        return queries[keep], triangles[keep], points[keep], distances[keep].astype(np.float32)
+
+    def cast_rays(self, origins: np.ndarray, directions: np.ndarray, max_range: Union[float, np.ndarray] = np.inf) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the first triangle hit by each ray, traversing the hierarchy for all rays at once. Boxes beyond
+        the nearest hit found so far are skipped.
+
+        Args:
+            origins (np.ndarray):    Ray origins of shape (N, 3).
+            directions (np.ndarray): Unit ray directions of shape (N, 3).
+            max_range (float | np.ndarray): Maximum distance along the rays (scalar or per ray).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Distances to the first hit (N,) (inf if none within `max_range`) and
+                                           triangles hit (N,) (-1 if none).
+        """
+        origins = np.asarray(origins, dtype=np.float32).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float32).reshape(-1, 3)
+        with np.errstate(divide='ignore'):
+            inv_directions = 1 / directions
+
+        best = np.broadcast_to(np.asarray(max_range, dtype=np.float32), len(origins)).copy()
+        hits = np.full(len(origins), -1, dtype=np.int64)
+        rays = np.arange(len(origins))
+        nodes = np.zeros(len(origins), dtype=np.int64)
+
+        while len(rays):
+            # Slab test against the boxes, discarding boxes behind the ray or beyond its nearest hit
+            # (NaNs of rays lying in a slab plane are ignored by fmin/fmax)
+            o, inv = origins[rays], inv_directions[rays]
+            with np.errstate(invalid='ignore'):
+                t0 = (self._node_min[nodes] - o) * inv
+                t1 = (self._node_max[nodes] - o) * inv
+            t_near = np.fmax.reduce(np.fmin(t0, t1), axis=-1)
+            t_far = np.fmin.reduce(np.fmax(t0, t1), axis=-1)
+            hit = (t_far >= np.maximum(t_near, 0)) & (t_near <= best[rays])
+            rays, nodes = rays[hit], nodes[hit]
+
+            # Leaves are intersected with their triangles; inner nodes are replaced by their children
+            leaf = self._left[nodes] < 0
+            counts = self._count[nodes[leaf]]
+            if len(counts):
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                cand_rays = np.repeat(rays[leaf], counts)
+                cand_triangles = self._order[np.repeat(self._start[nodes[leaf]], counts) + offsets]
+                corners = self._corners[cand_triangles]
+                t = intersect_triangles(origins[cand_rays], directions[cand_rays], corners[:, 0], corners[:, 1], corners[:, 2])
+
+                np.minimum.at(best, cand_rays, t)
+                closest = np.isfinite(t) & (t == best[cand_rays])
+                hits[cand_rays[closest]] = cand_triangles[closest]
+
+            inner = ~leaf
+            rays = np.concatenate([rays[inner], rays[inner]])
+            nodes = np.concatenate([self._left[nodes[inner]], self._right[nodes[inner]]])
+
+        best[hits < 0] = np.inf
+        return best, hits
+
+
+def find_sphere_pairs(centers: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+    """Finds all pairs of overlapping spheres using a spatial hash with cells of one sphere diameter,
+    so that only spheres in the same or neighbouring cells are compared.
+
+    Args:
+        centers (np.ndarray): Sphere centers of shape (N, 3).
+        radius (float):       Sphere radius.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indices i < j of overlapping spheres, each of shape (K,).
+    """
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    if len(centers) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Exact cell keys (cells are shifted so that all neighbours have non-negative coordinates)
+    cells = np.floor(centers / (2 * radius)).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    to_key = lambda cells: (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    keys = to_key(cells)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    pairs_i, pairs_j = [], []
+    for offset in _HALF_NEIGHBOURS:
+        neighbour_keys = to_key(cells + offset)
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        counts = np.searchsorted(sorted_keys, neighbour_keys, side='right') - lo
+
+        i = np.repeat(np.arange(len(centers)), counts)
+        j = order[np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+        if not offset.any():
+            i, j = i[i < j], j[i < j]
+        pairs_i.append(i)
+        pairs_j.append(j)
+
+    i, j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    overlap = np.sum((centers[i] - centers[j]) ** 2, axis=-1) <= (2 * radius) ** 2
+    i, j = i[overlap], j[overlap]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+class CollisionWorld:
+    def __init__(self, drone_radius: float = 0.35) -> None:
+        """Collision detection between drones (as spheres), static meshes and each other. Hierarchies over
+        the triangles of static meshes are built once when they are added.
+
+        Args:
+            drone_radius (float): Radius of the sphere bounding each drone.
+        """
+        self._drone_radius = drone_radius
+        self._bvhs = []
+
+    @property
+    def drone_radius(self) -> float:
+        return self._drone_radius
+
+    def add_static(self, mesh: object, leaf_size: int = 8) -> int:
+        """Adds a mesh that no longer moves; its triangles are transformed to world space once.
+
+        Args:
+            mesh (Mesh):     Mesh whose full-detail geometry is used.
+            leaf_size (int): Maximum number of triangles per leaf of the hierarchy.
+
+        Returns:
+            int: Index of the mesh in contacts.
+        """
+        geometry = mesh.geometry
+        vertices = np.asarray(geometry.positions.data, dtype=np.float32)
+        matrix = np.asarray(mesh.get_instance().world.matrix, dtype=np.float32)
+        vertices = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+
+        self._bvhs.append(TriangleBVH(vertices, np.asarray(geometry.indices.data), leaf_size=leaf_size))
+        LOGGER.info(f'CollisionWorld.add_static() :: built hierarchy of {self._bvhs[-1].num_nodes} nodes over {self._bvhs[-1].num_triangles} triangles')
+        return len(self._bvhs) - 1
+
+    def query_static(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Finds contacts between drones and static meshes (the deepest contact per drone and mesh).
+
+        Args:
+            positions (np.ndarray): Drone positions of shape (num_drones, 3).
+
+        Returns:
+            tuple: Drone indices (K,), mesh indices (K,), contact points (K, 3), normals pointing towards
+                   the drone (K, 3) and penetration depths (K,).
+        """
+        start = PROFILER.start()
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        drones, meshes, points, distances = [], [], [], []
+        for index, bvh in enumerate(self._bvhs):
+            hit_drones, _, hit_points, hit_distances = bvh.query_spheres(positions, self._drone_radius)
+            drones.append(hit_drones)
+            meshes.append(np.full(len(hit_drones), index, dtype=np.int64))
+            points.append(hit_points)
+            distances.append(hit_distances)
+
+        drones = np.concatenate(drones) if drones else np.zeros(0, dtype=np.int64)
+        meshes = np.concatenate(meshes) if meshes else np.zeros(0, dtype=np.int64)
+        points = np.concatenate(points) if points else np.zeros((0, 3), dtype=np.float32)
+        distances = np.concatenate(distances) if distances else np.zeros(0, dtype=np.float32)
+
+        normals = positions[drones] - points
+        normals /= np.maximum(distances, 1e-6)[:, None]
+        PROFILER.stop('collision.static', start)
+        return drones, meshes, points, normals, self._drone_radius - distances
+
+    def cast_rays(self, origins: np.ndarray, directions: np.ndarray, max_range: float = np.inf) -> tuple[np.ndarray, np.ndarray]:
+        """Casts rays against all static meshes.
+
+        Args:
+            origins (np.ndarray):    Ray origins of shape (N, 3).
+            directions (np.ndarray): Unit ray directions of shape (N, 3).
+            max_range (float):       Maximum distance along the rays.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Distances to the first hit (N,) (inf if none within `max_range`) and
+                                           indices of the meshes hit (N,) (-1 if none).
+        """
+        start = PROFILER.start()
+        distances = np.full(len(np.reshape(origins, (-1, 3))), np.inf, dtype=np.float32)
+        meshes = np.full(len(distances), -1, dtype=np.int64)
+        for index, bvh in enumerate(self._bvhs):
+            hit_distances, _ = bvh.cast_rays(origins, directions, max_range=np.minimum(distances, max_range))
+            closer = hit_distances < distances
+            distances[closer] = hit_distances[closer]
+            meshes[closer] = index
+        PROFILER.stop('collision.rays', start)
+        return distances, meshes
+
+    def query_drones(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Finds contacts between pairs of drones.
+
+        Args:
+            positions (np.ndarray): Drone positions of shape (num_drones, 3).
+
+        Returns:
+            tuple: Drone indices i < j (K,) and (K,), normals pointing from j to i (K, 3) and penetration depths (K,).
+        """
+        start = PROFILER.start()
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        i, j = find_sphere_pairs(positions, self._drone_radius)
+        offsets = positions[i] - positions[j]
+        distances = np.linalg.norm(offsets, axis=-1)
+        normals = offsets / np.maximum(distances, 1e-6)[:, None]
+        PROFILER.stop('collision.drones', start)
+        return i, j, normals, 2 * self._drone_radius - distances
@@ -6,7 +6,8 @@ class DebugTarget:
             x_range: tuple[float, float] = (5, 10),
             y_range: tuple[float, float] = (1, 3),
             z_range: tuple[float, float] = (5, 10),
-            reset_freq: int = 200
+            reset_freq: int = 200,
+            seed: int = None
             ) -> None:
         
         self._x_range = x_range
@@ -14,14 +15,15 @@ class DebugTarget:
         self._z_range = z_range
         self._reset_freq = reset_freq
         self._i = 0
+        self._rng = np.random.default_rng(seed)
 
         # Sample initial target
         self._target = self._sample_target()
 
     def _sample_target(self) -> np.ndarray:
-        x = np.random.uniform(*self._x_range)
-        y = np.random.uniform(*self._y_range)
-        z = np.random.uniform(*self._z_range)
+        x = self._rng.uniform(*self._x_range)
+        y = self._rng.uniform(*self._y_range)
+        z = self._rng.uniform(*self._z_range)
         return np.array([x, y, z], dtype=np.float32)
         
     def get_target(self) -> np.ndarray:
@@ -1,30 +1,71 @@
 import numpy as np
-import pylinalg as la
-from pyquaternion import Quaternion
 from typing import Iterable
+from pyuav.profiling import LOGGER, PROFILER
+
+UP = np.array([0, 1, 0], dtype=np.float32)
+
+# Fraction of velocity retained per reference time step (damping is rescaled to other time steps)
+DAMPING = 0.98
+DAMPING_DT = 0.05
+
 
 class QuadcopterPhysicsClient:
     def __init__(
             self, 
             num_drones: int = 1,
             positions: Iterable = [[0, 0, 0]], 
-            rotations: Iterable = [[0, 0, 0, 1]]
+            rotations: Iterable = [[0, 0, 0, 1]],
+            seed: int = None
             ) -> None:
-        """Implementation of the UAV dynamics using PyFlyt, modelled after the Crazyflie 2.0 nano-quadcopter.
+        """Primitive (kinematic) implementation of the UAV dynamics. All drone states are stored as
+        contiguous arrays so that a whole fleet can be advanced with a handful of NumPy operations.
 
         Args:
             num_drones (int): Total number of drones to simulate.
             positions (Iterable): Positions of quadcopters as a matrix of shape (num_drones, 3).
             rotations (Iterable): Rotations of quadcopters as a quaternion matrix of shape (num_drones, 4)
+            seed (int, optional): Seed of the random target disturbances (for reproducible runs).
         """
         assert len(positions) == len(rotations) == num_drones, 'Number of positions and rotations must be equal to number of drones'
         self._num_drones = num_drones
 
-        self._pos = np.array(positions, dtype=np.float32)
+        self._pos = np.array(positions, dtype=np.float32).reshape(num_drones, 3)
         self._vel = np.zeros((self._num_drones, 3), dtype=np.float32)
-        self._rot = Quaternion(w=1, x=0, y=0, z=0)
+        self._rot = self._normalize(np.array(rotations, dtype=np.float32).reshape(num_drones, 4))
+        self._rng = np.random.default_rng(seed)
         
-        print('QuadcopterPhysics.__init__() :: Initialized')
+        LOGGER.info('QuadcopterPhysics.__init__() :: Initialized')
+
+    @property
+    def num_drones(self) -> int:
+        return self._num_drones
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._pos
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._vel
+
+    @property
+    def rotations(self) -> np.ndarray:
+        return self._rot
+
+    def reset(self, indices: Iterable[int], positions: np.ndarray, rotations: np.ndarray, seed: int = None) -> None:
+        """Places a subset of drones at new poses at rest.
+
+        Args:
+            indices (Iterable):      Indices of drones to reset.
+            positions (np.ndarray):  New positions of shape (len(indices), 3).
+            rotations (np.ndarray):  New rotations of shape (len(indices), 4).
+            seed (int, optional):    Reseeds the random target disturbances.
+        """
+        self._pos[indices] = positions
+        self._vel[indices] = 0
+        self._rot[indices] = self._normalize(np.asarray(rotations, dtype=np.float32).reshape(-1, 4))
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
 
     def _cliplength(self, matrix: np.ndarray, max_: float = 1.0, axis: int = -1) -> np.ndarray:
         norm = np.linalg.norm(matrix, axis=-1, keepdims=True)
@@ -37,61 +78,126 @@ class QuadcopterPhysicsClient:
         return matrix / norm
     
     def _basis_to_quaternion(self, forw: np.ndarray, upv: np.ndarray) -> np.ndarray:
+        """Converts batches of forward and up vectors of shape (N, 3) to (x, y, z, w) quaternions of shape (N, 4).
+        """
         upv = self._normalize(upv)
         side = self._normalize(np.cross(forw, upv, axis=-1))
         forw = np.cross(upv, side, axis=-1)
-        matrix = np.array([forw, upv, side], dtype=np.float32).T
-        x, y, z, w = la.vec_normalize(la.quat_from_mat(matrix))
-        return Quaternion(w=w, x=x, y=y, z=z)
-        
-    def control(self, index: int, target: np.ndarray, heading: Iterable[float], dt: float = 0.05) -> None:
-        assert 0 <= index < self._num_drones
 
-        # Disturb target
-        target = np.array(target, dtype=np.float32) + np.random.normal(loc=0.0, scale=0.1, size=target.shape)
+        # Rotation matrices with (forw, upv, side) as columns
+        m = np.stack([forw, upv, side], axis=-1)
+        m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+
+        # Batched matrix-to-quaternion conversion; signs of the imaginary parts
+        # are recovered from the antisymmetric part of the matrix
+        quat = np.empty((len(m), 4), dtype=np.float32)
+        quat[:, 0] = np.copysign(0.5 * np.sqrt(np.maximum(0, 1 + m00 - m11 - m22)), m[:, 2, 1] - m[:, 1, 2])
+        quat[:, 1] = np.copysign(0.5 * np.sqrt(np.maximum(0, 1 - m00 + m11 - m22)), m[:, 0, 2] - m[:, 2, 0])
+        quat[:, 2] = np.copysign(0.5 * np.sqrt(np.maximum(0, 1 - m00 - m11 + m22)), m[:, 1, 0] - m[:, 0, 1])
+        quat[:, 3] = 0.5 * np.sqrt(np.maximum(0, 1 + m00 + m11 + m22))
+        return self._normalize(quat)
+
+    def _slerp(self, q0: np.ndarray, q1: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Spherical linear interpolation between batches of quaternions of shape (N, 4) along the shortest arc.
+        """
+        t = np.asarray(t, dtype=np.float32).reshape(-1, 1)
+
+        dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+        q1 = np.where(dot < 0, -q1, q1)
+        theta = np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+
+        # Fall back to linear interpolation for (nearly) identical rotations
+        sin_theta = np.sin(theta)
+        linear = sin_theta < 1e-6
+        sin_theta[linear] = 1.0
+        w0 = np.where(linear, 1 - t, np.sin((1 - t) * theta) / sin_theta)
+        w1 = np.where(linear, t, np.sin(t * theta) / sin_theta)
+        return self._normalize(w0 * q0 + w1 * q1).astype(np.float32)
+
+    def _step(self, index: slice, targets: np.ndarray, headings: np.ndarray, dt: float) -> None:
+        # Disturb targets
+        targets = targets + self._rng.normal(loc=0.0, scale=0.1, size=targets.shape).astype(np.float32)
 
         ####################
         #     Rotation
         ####################
 
-        # Calculate desired orientation while approaching target
-        direction = self._cliplength(target - self._pos[index], max_=1.0)
+        # Calculate desired orientation while approaching target (tilt is mirrored when descending)
+        offset = targets - self._pos[index]
+        direction = self._cliplength(offset, max_=1.0)
 
-        upwards = direction[1] > 0.0
-
-        if upwards:
-            approach_rotation = self._basis_to_quaternion(
-                forw=direction,
-                upv=self._normalize(1.3 * direction + np.array([0, 1, 0], dtype=np.float32))
-            )
-        else:
-            approach_rotation = self._basis_to_quaternion(
-                forw=direction,
-                upv=self._normalize(1.3 * -direction + np.array([0, 1, 0], dtype=np.float32))
-            )
+        tilt = np.where(direction[:, 1:2] > 0.0, 1.3, -1.3).astype(np.float32)
+        approach_rotation = self._basis_to_quaternion(
+            forw=direction,
+            upv=self._normalize(tilt * direction + UP)
+        )
 
         # Calculate desired orientation when target is reached (correct heading)
+        forw = np.zeros_like(direction)
+        forw[:, 0] = np.cos(headings + 1e-3)
+        forw[:, 2] = np.sin(headings + 1e-3)
         destination_rotation = self._basis_to_quaternion(
-            forw=np.array([np.cos(heading + 1e-3), 0, np.sin(heading + 1e-3)]),
-            upv=np.array([0, 1, 0], dtype=np.float32)
+            forw=forw,
+            upv=np.broadcast_to(UP, forw.shape)
         )
 
         # Interpolate between rotations based on proximity to target
-        prox = np.exp(-np.linalg.norm(target - self._pos[index]))
-        desired_rotation = Quaternion.slerp(approach_rotation, destination_rotation, prox)
-        self._rot = Quaternion.slerp(self._rot, desired_rotation, 0.5 * dt)
-
-        rotation = np.array([self._rot.x, self._rot.y, self._rot.z, self._rot.w])
+        prox = np.exp(-np.linalg.norm(offset, axis=-1))
+        desired_rotation = self._slerp(approach_rotation, destination_rotation, prox)
+        self._rot[index] = self._slerp(self._rot[index], desired_rotation, 0.5 * dt)
 
         ####################
         #     Position
         ####################
 
-        # Calculate desired direction of flight
-        self._vel[index] = self._cliplength(0.98 * self._vel[index] + 0.3 * dt * direction, max_=3.0)
+        # Calculate desired direction of flight (damping scaled by dt so that motion does not depend on the physics rate)
+        damping = DAMPING ** (dt / DAMPING_DT)
+        self._vel[index] = self._cliplength(damping * self._vel[index] + 0.3 * dt * direction, max_=3.0)
         self._pos[index] += dt * self._vel[index]
+
+    def control(self, index: int, target: np.ndarray, heading: float, dt: float = 0.05) -> tuple[np.ndarray, np.ndarray]:
+        """Advances a single drone towards its target.
+
+        Args:
+            index (int):         Index of drone to update.
+            target (np.ndarray): Target position of shape (3,).
+            heading (float):     Desired heading (in radians) once target is reached.
+            dt (float):          Time step in seconds.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: New position (3,) and (x, y, z, w) rotation (4,) of the drone.
+        """
+        assert 0 <= index < self._num_drones
+
+        target = np.array(target, dtype=np.float32).reshape(1, 3)
+        heading = np.array(heading, dtype=np.float32).reshape(1)
+
+        start = PROFILER.start()
+        self._step(slice(index, index + 1), target, heading, dt)
+        PROFILER.stop('physics.control', start)
         
-        return np.copy(self._pos[index]), np.array(rotation)
+        return np.copy(self._pos[index]), np.copy(self._rot[index])
+
+    def control_all(self, targets: np.ndarray, headings: Iterable[float], dt: float = 0.05) -> tuple[np.ndarray, np.ndarray]:
+        """Advances all drones towards their targets in a single batched step.
+
+        Args:
+            targets (np.ndarray): Target positions of shape (num_drones, 3).
+            headings (Iterable):  Desired headings (in radians) of shape (num_drones,).
+            dt (float):           Time step in seconds.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Positions (num_drones, 3) and (x, y, z, w) rotations (num_drones, 4).
+        """
+        targets = np.asarray(targets, dtype=np.float32)
+        headings = np.asarray(headings, dtype=np.float32)
+        assert targets.shape == (self._num_drones, 3) and headings.shape == (self._num_drones,)
+
+        start = PROFILER.start()
+        self._step(slice(None), targets, headings, dt)
+        PROFILER.stop('physics.control', start)
+
+        return self._pos.copy(), self._rot.copy()
         
 
 if __name__ == '__main__':
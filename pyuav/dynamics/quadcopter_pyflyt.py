@@ -2,13 +2,75 @@ import numpy as np
 import pylinalg as la
 from typing import Iterable
 from PyFlyt.core import Aviary
+from pyuav.profiling import LOGGER, PROFILER
+
+# Rotation of -90 degrees about Y used when converting between PyFlyt's Z-up and the renderer's Y-up frame
+_Y_ROTATION = np.array([0, np.sin(-np.pi / 4), 0, np.cos(-np.pi / 4)], dtype=np.float32)
+
+
+def quat_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Batched Hamilton product of (x, y, z, w) quaternions of shape (..., 4).
+    """
+    ax, ay, az, aw = np.moveaxis(a, -1, 0)
+    bx, by, bz, bw = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz
+    ], axis=-1)
+
+
+def quat_from_euler(angles: np.ndarray) -> np.ndarray:
+    """Batched conversion of extrinsic XYZ euler angles of shape (..., 3) to (x, y, z, w) quaternions (cf. `la.quat_from_euler`).
+    """
+    cx, cy, cz = np.moveaxis(np.cos(0.5 * angles), -1, 0)
+    sx, sy, sz = np.moveaxis(np.sin(0.5 * angles), -1, 0)
+    return np.stack([
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+        cx * cy * cz + sx * sy * sz
+    ], axis=-1)
+
+
+def xzy_to_xyz(a: np.ndarray) -> np.ndarray:
+    """Converts (batches of) vectors from the renderer's Y-up frame to PyFlyt's Z-up frame.
+    """
+    return np.asarray(a)[..., [0, 2, 1]]
+
+
+def xyz_to_xzy(a: np.ndarray) -> np.ndarray:
+    """Converts (batches of) vectors from PyFlyt's Z-up frame to the renderer's Y-up frame.
+    """
+    return np.asarray(a)[..., [0, 2, 1]]
+
+
+def xyz_to_xzy_quat(q: np.ndarray) -> np.ndarray:
+    """Converts (batches of) quaternions from PyFlyt's Z-up frame to the renderer's Y-up frame.
+    """
+    q = np.asarray(q)
+    q1 = np.stack([-q[..., 1], q[..., 2], -q[..., 0], q[..., 3]], axis=-1)
+    return quat_mul(_Y_ROTATION.astype(q.dtype), q1)
+
+
+def xzy_to_xyz_quat(q: np.ndarray) -> np.ndarray:
+    """Converts (batches of) quaternions from the renderer's Y-up frame to PyFlyt's Z-up frame (inverse of `xyz_to_xzy_quat`).
+    """
+    q = np.asarray(q)
+    conj = _Y_ROTATION * np.array([-1, -1, -1, 1], dtype=np.float32)
+    q1 = quat_mul(conj.astype(q.dtype), q)
+    return np.stack([-q1[..., 2], -q1[..., 0], q1[..., 1], q1[..., 3]], axis=-1)
+
 
 class QuadcopterPhysicsClient:
     def __init__(
             self, 
             num_drones: int = 1,
             positions: Iterable = [[0, 0, 0]], 
-            rotations: Iterable = [[0, 0, 0, 1]]
+            rotations: Iterable = [[0, 0, 0, 1]],
+            y_up: bool = False,
+            seed: int = None
             ) -> None:
         """Implementation of the UAV dynamics using PyFlyt, modelled after the Crazyflie 2.0 nano-quadcopter.
 
@@ -16,48 +78,93 @@ class QuadcopterPhysicsClient:
             num_drones (int): Total number of drones to simulate.
             positions (Iterable): Positions of quadcopters as a matrix of shape (num_drones, 3).
             rotations (Iterable): Rotations of quadcopters as a quaternion matrix of shape (num_drones, 4)
+            y_up (bool): Whether positions, targets and rotations are given in (and returned in) the renderer's 
+                         Y-up frame instead of PyFlyt's Z-up frame.
+            seed (int, optional): Seed of PyFlyt's random number generator (for reproducible runs).
         """
         assert len(positions) == len(rotations) == num_drones, 'Number of positions and rotations must be equal to number of drones'
+        self._y_up = y_up
+
+        positions = np.array(positions, dtype=np.float32).reshape(num_drones, 3)
+        rotations = np.array(rotations, dtype=np.float32).reshape(num_drones, 4)
+        if y_up:
+            positions, rotations = xzy_to_xyz(positions), xzy_to_xyz_quat(rotations)
 
         # Implements drone physics model
         self._base = Aviary(
-            start_pos=np.array(positions, dtype=np.float32),
-            start_orn=np.array([la.quat_to_euler(r) for r in rotations], dtype=np.float32),
+            start_pos=positions,
+            start_orn=np.array(la.quat_to_euler(rotations), dtype=np.float32).reshape(num_drones, 3),
             drone_type='quadx',
             render=False,
-            drone_options=dict(drone_model='primitive_drone')
+            drone_options=dict(drone_model='primitive_drone'),
+            seed=seed
         ) 
         self._base.set_mode([7] * num_drones) # == (x, y, yaw, z)
 
         self._num_drones = num_drones
         self._prev_setpoints = None
-        print('QuadcopterPhysics.__init__() :: Initialized')
+        LOGGER.info('QuadcopterPhysics.__init__() :: Initialized')
 
+    def get_states(self) -> np.ndarray:
+        """Returns states of all drones as array of shape (num_drones, 4, 3) with rows: body angular velocity, 
+        ground angular position (euler), body linear velocity and ground linear position (in PyFlyt's frame).
+        """
+        return np.asarray(self._base.all_states, dtype=np.float32)
         
-    def control(self, targets: np.ndarray, headings: Iterable[float]) -> None:
+    def control(self, targets: np.ndarray, headings: Iterable[float], steps: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Advances all drones towards their targets.
+
+        Args:
+            targets (np.ndarray): Target positions of shape (num_drones, 3).
+            headings (Iterable):  Desired headings (in radians) of shape (num_drones,).
+            steps (int):          Number of Aviary steps to advance.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Positions (num_drones, 3) and (x, y, z, w) rotations (num_drones, 4).
+        """
+        targets = np.asarray(targets, dtype=np.float32)
         assert len(targets) == len(headings) == self._num_drones
+        if self._y_up:
+            targets = xzy_to_xyz(targets)
 
         # Define setpoint as XYHZ
         x, y, z = targets.T
         h = np.array(headings, dtype=np.float32)
         setpoints = np.c_[x, y, h, z]
 
-        # Update setpoint if target or heading changed
-        if setpoints is not self._prev_setpoints:
+        start = PROFILER.start()
+
+        # Update setpoint only if a target or heading actually changed
+        if self._prev_setpoints is None or not np.array_equal(setpoints, self._prev_setpoints):
             self._prev_setpoints = setpoints
             self._base.set_all_setpoints(setpoints=setpoints)
+            PROFILER.count('physics.setpoint_updates')
 
         # Advance simulation state
-        self._base.step()
+        for _ in range(steps):
+            self._base.step()
 
-        # Get position and quaternion rotations
-        positions = np.zeros((self._num_drones, 3), dtype=np.float32)
-        rotations = np.zeros((self._num_drones, 4), dtype=np.float32)
-        for i, state in enumerate(self._base.all_states):
-            positions[i, :] = state[3]
-            rotations[i, :] = la.quat_from_euler(state[1])
+        # Get position and quaternion rotations of all drones at once
+        states = self.get_states()
+        positions = np.ascontiguousarray(states[:, 3])
+        rotations = quat_from_euler(states[:, 1]).astype(np.float32)
+        PROFILER.stop('physics.control', start)
 
+        if self._y_up:
+            return xyz_to_xzy(positions), xyz_to_xzy_quat(rotations)
         return positions, rotations
+
+    def control_all(self, targets: np.ndarray, headings: Iterable[float], dt: float = None) -> tuple[np.ndarray, np.ndarray]:
+        """Advances all drones towards their targets by one control period (`dt` is ignored, as PyFlyt
+        advances by its own fixed period).
+        """
+        return self.control(targets=targets, headings=headings)
+
+
+def create_client(num_drones: int = 1, positions: Iterable = [[0, 0, 0]], rotations: Iterable = [[0, 0, 0, 1]], seed: int = None) -> QuadcopterPhysicsClient:
+    """Creates a PyFlyt client working in the renderer's Y-up frame (dynamics backend 'pyflyt').
+    """
+    return QuadcopterPhysicsClient(num_drones=num_drones, positions=positions, rotations=rotations, y_up=True, seed=seed)
         
 
 if __name__ == '__main__':
@@ -1,8 +1,14 @@
-from pyuav.graphics.meshes import Mesh, Material
+import weakref
+import numpy as np
+import pygfx as gfx
+from typing import Iterable
+from pyuav.graphics.meshes import Mesh, InstancedMesh, Material, compose_matrices, unregister_instance_id
 from pyuav.graphics.rendering import PerspectiveCamera
-from pyuav.dynamics.quadcopter_primitive import QuadcopterPhysicsClient as PrimitiveQuadcopterPhysicsClient
-from pyuav.dynamics.quadcopter_pyflyt import QuadcopterPhysicsClient as PyFlytQuadcopterPhysicsClient
-from pyuav.graphics.datatypes import Vector3f, Quaternion
+from pyuav.graphics.transforms import TRANSFORMS, quat_from_y_angles
+from pyuav.backends import DYNAMICS
+from pyuav.sensors import Lidar
+from pyuav.graphics.datatypes import GfxObject, Vector3f, Quaternion
+from pyuav.profiling import PROFILER
 
 # Files
 MODEL_FILEPATH = "assets\\low_poly_drone\\body.obj"
@@ -11,15 +17,29 @@ TEXTURE_FILEPATH = "assets\\low_poly_drone\\diffuse.png"
 ROTOR_FILEPATH = "assets\\low_poly_drone\\rotor.obj"
 ROTOR_COLOR = "#333333" # dark gray
 
+# Rotor placement relative to body (lf, lr, rf, rr) and spin direction
+ROTOR_POSITIONS = ((0.25, 0.0, 0.25), (0.25, 0.0, -0.25), (-0.25, 0.0, 0.25), (-0.25, 0.0, -0.25))
+ROTOR_SPINS = (1, -1, -1, 1)
+ROTOR_SPEED = 20.0 # radians per second
+
 
 class Quadcopter:
     def __init__(
             self, 
             position: Vector3f = (0, 0, 0),
             rotation: Quaternion = (0, 0, 0, 1),
-            mode: str = 'primitive'
+            mode: str = 'primitive',
+            seed: int = None
             ) -> None:
-        
+        """Quadcopter with a body, four spinning rotors and a body-mounted camera (created on first use).
+
+        Args:
+            position (Vector3f):  Initial position.
+            rotation (Quaternion): Initial rotation.
+            mode (str):           Dynamics backend registered in `pyuav.backends.DYNAMICS`; 'pyflyt' or 'primitive' (default).
+                                  None creates a visual-only quadcopter posed with `set_pose` (e.g. by a `Fleet`).
+            seed (int, optional): Seed of the physics backend's random number generator (for reproducible runs).
+        """
         # UAV body
         self._body = Mesh(
             file_path=MODEL_FILEPATH,
@@ -36,47 +56,215 @@ class Quadcopter:
             parent=self._body
             )
         
-        self._rotor_lf = create_rotor((0.25, 0.0, 0.25))
-        self._rotor_lr = create_rotor((0.25, 0.0, -0.25))
-        self._rotor_rf = create_rotor((-0.25, 0.0, 0.25))
-        self._rotor_rr = create_rotor((-0.25, 0.0, -0.25))
+        self._rotor_lf = create_rotor(ROTOR_POSITIONS[0])
+        self._rotor_lr = create_rotor(ROTOR_POSITIONS[1])
+        self._rotor_rf = create_rotor(ROTOR_POSITIONS[2])
+        self._rotor_rr = create_rotor(ROTOR_POSITIONS[3])
+
+        # Poses of body and rotors are kept in the shared transform store (written to the scene graph before rendering),
+        # whose slots are freed by `release` or once the quadcopter is garbage collected
+        self._body_handle = TRANSFORMS.add(self._body)
+        self._rotor_handles = np.array([TRANSFORMS.add(rotor) for rotor in (self._rotor_lf, self._rotor_lr, self._rotor_rf, self._rotor_rr)])
+        self._finalizer = weakref.finalize(self, TRANSFORMS.remove, np.append(self._rotor_handles, self._body_handle))
+        self._rotor_spins = np.array(ROTOR_SPINS, dtype=np.float32)
+        self._time = 0.0
         
-        # Whether to attach a camera to the UAV's body
-        self._camera = PerspectiveCamera(
-            position=position,
-            parent=self._body
-            )
+        # Camera attached to the UAV's body (created on first use)
+        self._camera = None
+        self._camera_position = position
         
-        # Add rigid body physics to body
-        if mode == 'primitive':
-            self._physics_client = PrimitiveQuadcopterPhysicsClient(positions=[position], rotations=[rotation])
-        elif mode == 'pyflyt':
-            self._physics_client = PyFlytQuadcopterPhysicsClient(positions=[position], rotations=[rotation])
-        else:
-            raise Exception(f"mode '{mode}' not understood. Choose from 'pyflyt' or 'primitive' (default).")
+        # Add rigid body physics to body (backend is imported on first use)
+        self._physics_client = None
+        if mode is not None:
+            self._physics_client = DYNAMICS.create(mode, num_drones=1, positions=[position], rotations=[rotation], seed=seed)
+        self._mode = mode
 
     @property
     def body_and_rotors(self) -> Mesh:
+        """Body mesh (with the rotors as children) to add to a `Scene`. Its pose is owned by the shared transform
+        store, so pose the quadcopter with `set_pose` rather than through the mesh.
+        """
         return self._body
     
     @property
     def camera(self) -> PerspectiveCamera:
+        if self._camera is None:
+            self._camera = PerspectiveCamera(
+                position=self._camera_position,
+                parent=self._body
+                )
         return self._camera
+
+    def release(self) -> None:
+        """Frees the slots of the body and rotors in the shared transform store and their instance IDs; the quadcopter
+        can no longer be posed. Slots are also freed when the quadcopter is garbage collected.
+        """
+        self._finalizer()
+        for mesh in (self._body, self._rotor_lf, self._rotor_lr, self._rotor_rf, self._rotor_rr):
+            unregister_instance_id(mesh.get_instance())
+        self._body_handle = None
+        self._rotor_handles = None
     
-    def control(self, target: Vector3f, heading: float) -> None:
-        new_position, new_rotation = self._physics_client.control(index=0, target=target, heading=heading)
+    def control(self, target: Vector3f, heading: float, dt: float = 0.05) -> None:
+        """Advances quadcopter towards target.
+
+        Args:
+            target (Vector3f): Target position.
+            heading (float):   Desired heading (in radians) once target is reached.
+            dt (float):        Time step in seconds (PyFlyt advances by its own fixed control period instead).
+        """
+        assert self._physics_client is not None, 'Visual-only quadcopters (mode=None) cannot be controlled'
+        positions, rotations = self._physics_client.control_all(targets=np.array([target], dtype=np.float32), headings=[heading], dt=dt)
+        new_position, new_rotation = positions[0], rotations[0]
+
+        start = PROFILER.start()
+        self.set_pose(new_position, new_rotation)
 
-        self._body.set_position(new_position)
-        self._body.set_rotation(new_rotation)
+        # Make rotors turn for aesthetic purposes (angle follows from simulated time)
+        self.set_time(self._time + dt)
+        PROFILER.stop('transforms.quadcopter', start)
 
-        # Make rotors turn for aesthetic purposes
-        self._rotor_rf.rotate_y(-1)
-        self._rotor_rr.rotate_y(1)
-        self._rotor_lf.rotate_y(1)
-        self._rotor_lr.rotate_y(-1)
+    def set_time(self, time: float) -> None:
+        """Sets the simulated time, which determines the angles of the (spinning) rotors.
+        """
+        assert self._rotor_handles is not None, 'Released quadcopters can no longer be posed'
+        self._time = time
+        TRANSFORMS.set_rotations(self._rotor_handles, quat_from_y_angles(ROTOR_SPEED * time * self._rotor_spins))
 
     def get_position(self) -> Vector3f:
-        return self._body.get_position()
+        assert self._body_handle is not None, 'Released quadcopters can no longer be posed'
+        return TRANSFORMS.get_positions(self._body_handle)
     
     def get_rotation(self) -> Vector3f:
-        return self._body.get_rotation()
\ No newline at end of file
+        assert self._body_handle is not None, 'Released quadcopters can no longer be posed'
+        return TRANSFORMS.get_rotations(self._body_handle)
+
+    def get_pose(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.array(self.get_position(), dtype=np.float32), np.array(self.get_rotation(), dtype=np.float32)
+
+    def set_pose(self, position: Vector3f, rotation: Quaternion) -> None:
+        """Sets (visual) pose of quadcopter body without affecting its physics state.
+        """
+        assert self._body_handle is not None, 'Released quadcopters can no longer be posed'
+        TRANSFORMS.set_poses(self._body_handle, position, rotation)
+
+    def scan(self, lidar: Lidar) -> np.ndarray:
+        """Measures ranges with a body-mounted lidar (see `pyuav.sensors.Lidar`).
+
+        Returns:
+            np.ndarray: Ranges of shape (vertical_beams, horizontal_beams).
+        """
+        position, rotation = self.get_pose()
+        return lidar.scan(position[np.newaxis], rotation[np.newaxis])[0]
+
+
+class Swarm(GfxObject):
+    def __init__(
+            self, 
+            positions: Iterable[Vector3f],
+            rotations: Iterable[Quaternion] = None,
+            mode: str = 'primitive',
+            seed: int = None
+            ) -> None:
+        """Fleet of quadcopters rendered with GPU instancing: all bodies and all rotors are drawn 
+        with one draw call each and their poses are updated with a single array write per frame. Instances are posed
+        through their matrices and do not occupy slots in the shared transform store.
+
+        Args:
+            positions (Iterable): Positions of quadcopters as a matrix of shape (num_drones, 3).
+            rotations (Iterable): Rotations of quadcopters as a quaternion matrix of shape (num_drones, 4). 
+                                  Defaults to the identity rotation.
+            mode (str):           Dynamics backend registered in `pyuav.backends.DYNAMICS`; 'pyflyt' or 'primitive' (default).
+            seed (int, optional): Seed of the physics backend's random number generator (for reproducible runs).
+        """
+        positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        num_drones = len(positions)
+        if rotations is None:
+            rotations = np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (num_drones, 1))
+        rotations = np.array(rotations, dtype=np.float32).reshape(num_drones, 4)
+        self._num_drones = num_drones
+
+        # Instanced bodies and rotors (rotors of drone i occupy instances 4i..4i+3)
+        self._bodies = InstancedMesh(MODEL_FILEPATH, Material(TEXTURE_FILEPATH), count=num_drones)
+        self._rotors = InstancedMesh(ROTOR_FILEPATH, Material(diffuse=ROTOR_COLOR), count=4 * num_drones)
+
+        self._instance = gfx.Group()
+        self._instance.add(self._bodies.get_instance(), self._rotors.get_instance())
+
+        # Rotor translations relative to body and their spin per step
+        self._rotor_offsets = np.array(ROTOR_POSITIONS, dtype=np.float32)
+        self._rotor_spins = np.array(ROTOR_SPINS, dtype=np.float32)
+        self._time = 0.0
+
+        # Add rigid body physics to all bodies
+        self._physics_client = DYNAMICS.create(mode, num_drones=num_drones, positions=positions, rotations=rotations, seed=seed)
+        self._mode = mode
+
+        self._positions = positions
+        self._rotations = rotations
+        self._update_instances()
+
+    @property
+    def num_drones(self) -> int:
+        return self._num_drones
+
+    def _update_instances(self) -> None:
+        bodies = compose_matrices(self._positions, self._rotations)
+
+        # Rotor matrices: body @ translate(offset) @ rotate_y(angle)
+        angles = self._rotor_spins * ROTOR_SPEED * self._time
+        rotors = np.zeros((4, 4, 4), dtype=np.float32)
+        rotors[:, 0, 0] = np.cos(angles)
+        rotors[:, 0, 2] = np.sin(angles)
+        rotors[:, 2, 0] = -np.sin(angles)
+        rotors[:, 2, 2] = np.cos(angles)
+        rotors[:, 1, 1] = 1
+        rotors[:, :3, 3] = self._rotor_offsets
+        rotors[:, 3, 3] = 1
+
+        self._bodies.set_matrices(bodies)
+        self._rotors.set_matrices(np.matmul(bodies[:, np.newaxis], rotors).reshape(-1, 4, 4))
+
+    def control(self, targets: np.ndarray, headings: Iterable[float], dt: float = 0.05) -> None:
+        """Advances all quadcopters towards their targets and updates their instances.
+
+        Args:
+            targets (np.ndarray): Target positions of shape (num_drones, 3).
+            headings (Iterable):  Desired headings (in radians) of shape (num_drones,).
+            dt (float):           Time step in seconds (PyFlyt advances by its own fixed control period instead).
+        """
+        targets = np.asarray(targets, dtype=np.float32)
+        positions, rotations = self._physics_client.control_all(targets=targets, headings=headings, dt=dt)
+
+        # Make rotors turn for aesthetic purposes (angle follows from simulated time)
+        self._time += dt
+        self.set_pose(positions, rotations)
+
+    def get_pose(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._positions, self._rotations
+
+    def set_time(self, time: float) -> None:
+        """Sets the simulated time, which determines the angles of the (spinning) rotors (applied with the next pose).
+        """
+        self._time = time
+
+    def set_pose(self, positions: np.ndarray, rotations: np.ndarray) -> None:
+        """Sets (visual) poses of all quadcopters without affecting their physics state.
+        """
+        self._positions = np.asarray(positions, dtype=np.float32)
+        self._rotations = np.asarray(rotations, dtype=np.float32)
+        self._update_instances()
+
+    def get_positions(self) -> np.ndarray:
+        return self._positions
+    
+    def get_rotations(self) -> np.ndarray:
+        return self._rotations
+
+    def scan(self, lidar: Lidar) -> np.ndarray:
+        """Measures ranges of all quadcopters with body-mounted lidars in one batched call (see `pyuav.sensors.Lidar`).
+
+        Returns:
+            np.ndarray: Ranges of shape (num_drones, vertical_beams, horizontal_beams).
+        """
+        return lidar.scan(self._positions, self._rotations)
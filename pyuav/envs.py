@@ -0,0 +1,218 @@
+import numpy as np
+from typing import Iterable, Union
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv, AutoresetMode
+from gymnasium.vector.utils import batch_space
+from pyuav.dynamics.quadcopter_primitive import QuadcopterPhysicsClient
+from pyuav.sensors import Lidar
+
+# Camera rotation relative to the drone body, turning the camera's view direction (-Z) to the drone's forward axis (+X)
+_CAMERA_ROTATION = np.array([0, np.sin(-np.pi / 4), 0, np.cos(-np.pi / 4)], dtype=np.float32)
+
+# Layout of state observations: offset to goal (3), velocity (3) and (x, y, z, w) rotation (4)
+STATE_SIZE = 10
+
+
+class QuadcopterVecEnv(VectorEnv):
+    metadata = {'autoreset_mode': AutoresetMode.NEXT_STEP, 'render_modes': ['rgb_array']}
+
+    def __init__(
+            self,
+            num_envs: int = 1,
+            dt: float = 0.05,
+            max_steps: int = 500,
+            spawn_range: tuple[Iterable[float], Iterable[float]] = ((-10, 0, -10), (10, 5, 10)),
+            goal_range: tuple[Iterable[float], Iterable[float]] = ((-10, 1, -10), (10, 10, 10)),
+            goal_tolerance: float = 0.5,
+            action_scale: float = 2.0,
+            image_size: tuple[int, int] = None,
+            lidar: Lidar = None,
+            render_mode: str = None,
+            seed: int = None,
+            backend: str = 'pygfx'
+            ) -> None:
+        """Vectorized goal-reaching environment (Gymnasium `VectorEnv`) with one drone per sub-environment,
+        stepped in a single batch by the primitive dynamics. Graphics are only built if image observations
+        or rendering are requested.
+
+        Actions are of shape (num_envs, 4) in [-1, 1]: target offset relative to the drone (scaled by `action_scale`)
+        and heading (scaled by pi). Rewards are the negative distance to the goal; a sub-environment terminates once its
+        drone is within `goal_tolerance` of the goal, is truncated after `max_steps` and is reset on the next step.
+
+        Args:
+            num_envs (int):              Number of drones (sub-environments).
+            dt (float):                  Time step in seconds.
+            max_steps (int):             Number of steps after which an episode is truncated.
+            spawn_range (tuple):         Lower and upper bounds of initial positions.
+            goal_range (tuple):          Lower and upper bounds of goal positions.
+            goal_tolerance (float):      Distance to goal at which an episode terminates.
+            action_scale (float):        Maximum target offset (in meters) per axis.
+            image_size (tuple, optional): Size (width, height) of RGB images observed from each drone's camera.
+                                         Observations are then dicts with 'state' and 'image' arrays.
+            lidar (Lidar, optional):     Body-mounted lidar whose ranges are observed (ray cast, without rendering).
+                                         Observations are then dicts with 'state' and 'ranges' arrays.
+            render_mode (str, optional): 'rgb_array' to render an overview of all drones with `render()`.
+            seed (int, optional):        Seed of spawn positions, goals and dynamics.
+            backend (str):               Renderer backend registered in `pyuav.backends.RENDERERS`; 'pygfx' (default).
+        """
+        self.num_envs = num_envs
+        self.render_mode = render_mode
+        self._dt = dt
+        self._max_steps = max_steps
+        self._spawn_range = np.array(spawn_range, dtype=np.float32)
+        self._goal_range = np.array(goal_range, dtype=np.float32)
+        self._goal_tolerance = goal_tolerance
+        self._action_scale = action_scale
+        self._image_size = image_size
+        self._lidar = lidar
+        self._backend = backend
+        self._rng = np.random.default_rng(seed)
+
+        self.single_action_space = spaces.Box(-1, 1, shape=(4,), dtype=np.float32)
+        self.action_space = spaces.Box(-1, 1, shape=(num_envs, 4), dtype=np.float32)
+        state_space = spaces.Box(-np.inf, np.inf, shape=(STATE_SIZE,), dtype=np.float32)
+        observation_spaces = dict(state=state_space)
+        if image_size is not None:
+            width, height = image_size
+            observation_spaces['image'] = spaces.Box(0, 255, shape=(height, width, 3), dtype=np.uint8)
+        if lidar is not None:
+            observation_spaces['ranges'] = spaces.Box(0, lidar.max_range, shape=lidar.shape, dtype=np.float32)
+        self.single_observation_space = state_space if len(observation_spaces) == 1 else spaces.Dict(**observation_spaces)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        # Dynamics of all drones
+        self._client = QuadcopterPhysicsClient(
+            num_drones=num_envs,
+            positions=self._sample(self._spawn_range, num_envs),
+            rotations=np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (num_envs, 1)),
+            seed=seed
+            )
+
+        # Preallocated buffers (returned arrays are overwritten by the next call)
+        self._goals = np.zeros((num_envs, 3), dtype=np.float32)
+        self._targets = np.zeros((num_envs, 3), dtype=np.float32)
+        self._headings = np.zeros(num_envs, dtype=np.float32)
+        self._steps = np.zeros(num_envs, dtype=np.int64)
+        self._states = np.zeros((num_envs, STATE_SIZE), dtype=np.float32)
+        self._distances = np.zeros(num_envs, dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._terminations = np.zeros(num_envs, dtype=bool)
+        self._truncations = np.zeros(num_envs, dtype=bool)
+        self._needs_reset = np.zeros(num_envs, dtype=bool)
+        self._images = None if image_size is None else np.zeros((num_envs, image_size[1], image_size[0], 3), dtype=np.uint8)
+
+        # Graphics (created on first use)
+        self._graphics = None
+
+    @property
+    def goals(self) -> np.ndarray:
+        return self._goals
+
+    def _sample(self, bounds: np.ndarray, count: int) -> np.ndarray:
+        return self._rng.uniform(bounds[0], bounds[1], size=(count, 3)).astype(np.float32)
+
+    def _reset_drones(self, indices: np.ndarray, seed: int = None) -> None:
+        count = len(indices)
+        rotations = np.zeros((count, 4), dtype=np.float32)
+        rotations[:, 3] = 1
+        self._client.reset(indices, self._sample(self._spawn_range, count), rotations, seed=seed)
+        self._goals[indices] = self._sample(self._goal_range, count)
+        self._steps[indices] = 0
+
+    def _observe(self) -> Union[np.ndarray, dict[str, np.ndarray]]:
+        np.subtract(self._client.positions, self._goals, out=self._states[:, 0:3])
+        self._states[:, 3:6] = self._client.velocities
+        self._states[:, 6:10] = self._client.rotations
+        if self._images is None and self._lidar is None:
+            return self._states
+
+        observations = dict(state=self._states)
+        if self._images is not None:
+            self._render_cameras()
+            observations['image'] = self._images
+        if self._lidar is not None:
+            observations['ranges'] = self._lidar.scan(self._client.positions, self._client.rotations)
+        return observations
+
+    def reset(self, seed: int = None, options: dict = None) -> tuple[np.ndarray, dict]:
+        """Resets all sub-environments.
+
+        Returns:
+            tuple: Observations of shape (num_envs, 10) (or a dict with 'state' and 'image') and an empty info dict.
+        """
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_drones(np.arange(self.num_envs), seed=seed)
+        self._needs_reset[:] = False
+        return self._observe(), {}
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Steps all sub-environments at once; sub-environments that finished in the previous step are reset instead.
+
+        Args:
+            actions (np.ndarray): Actions of shape (num_envs, 4) in [-1, 1].
+
+        Returns:
+            tuple: Observations, rewards (num_envs,), terminations (num_envs,), truncations (num_envs,) and an empty info dict.
+        """
+        actions = np.clip(np.asarray(actions, dtype=np.float32).reshape(self.num_envs, 4), -1, 1)
+        np.multiply(actions[:, :3], self._action_scale, out=self._targets)
+        self._targets += self._client.positions
+        np.multiply(actions[:, 3], np.pi, out=self._headings)
+
+        self._client.control_all(self._targets, self._headings, dt=self._dt)
+        self._steps += 1
+
+        # Autoreset sub-environments that finished in the previous step (their actions are ignored)
+        resets = np.flatnonzero(self._needs_reset)
+        if len(resets):
+            self._reset_drones(resets)
+
+        observations = self._observe()
+        self._distances[:] = np.linalg.norm(self._states[:, 0:3], axis=-1)
+        np.negative(self._distances, out=self._rewards)
+        np.less(self._distances, self._goal_tolerance, out=self._terminations)
+        np.greater_equal(self._steps, self._max_steps, out=self._truncations)
+
+        self._rewards[resets] = 0
+        self._terminations[resets] = False
+        self._truncations[resets] = False
+        np.logical_or(self._terminations, self._truncations, out=self._needs_reset)
+        return observations, self._rewards, self._terminations, self._truncations, {}
+
+    def _build_graphics(self) -> dict:
+        from pyuav.entities import Swarm
+        from pyuav.graphics.lighting import AmbientLight, DirectionalLight
+        from pyuav.backends import RENDERERS
+        from pyuav.graphics.rendering import Scene, Grid, PerspectiveCamera
+
+        swarm = Swarm(positions=self._client.positions, rotations=self._client.rotations)
+        scene = Scene(Grid(), AmbientLight(), DirectionalLight(), swarm)
+        width, height = self._image_size or (640, 480)
+        overview = PerspectiveCamera(position=(25, 15, 25))
+        overview.set_lookat((0, 0, 0))
+        cameras = [PerspectiveCamera() for _ in range(self.num_envs)] if self._image_size is not None else []
+        return dict(swarm=swarm, scene=scene, overview=overview, cameras=cameras, renderer=RENDERERS.create(self._backend, width=width, height=height))
+
+    def _render_cameras(self) -> None:
+        import pylinalg as la
+
+        if self._graphics is None:
+            self._graphics = self._build_graphics()
+        graphics = self._graphics
+        graphics['swarm'].set_pose(self._client.positions, self._client.rotations)
+
+        for camera, position, rotation in zip(graphics['cameras'], self._client.positions, self._client.rotations):
+            camera.set_position(position, mode='world')
+            camera.set_rotation(la.quat_mul(rotation, _CAMERA_ROTATION), mode='world')
+        graphics['renderer'].render_many(graphics['scene'], graphics['cameras'], out=self._images, pixel_format='rgb')
+
+    def render(self) -> np.ndarray:
+        """Renders an overview of all drones (requires `render_mode='rgb_array'`).
+        """
+        assert self.render_mode == 'rgb_array', "Rendering requires render_mode='rgb_array'"
+        if self._graphics is None:
+            self._graphics = self._build_graphics()
+        graphics = self._graphics
+        graphics['swarm'].set_pose(self._client.positions, self._client.rotations)
+        return graphics['renderer'].render(graphics['scene'], graphics['overview'], pixel_format='rgb')
@@ -0,0 +1,236 @@
+import numpy as np
+from typing import Iterable
+from pyuav.backends import DYNAMICS
+from pyuav.sensors import Lidar, rotate_vectors
+from pyuav.profiling import LOGGER, PROFILER
+
+# Radius (in meters) of the sphere bounding a quadcopter, used to test whether it is in view
+DRONE_RADIUS = 0.5
+
+
+class Drone:
+    """Lightweight handle of a single drone in a `Fleet` (an index into the fleet's arrays).
+    """
+    __slots__ = ('_fleet', '_index')
+
+    def __init__(self, fleet: 'Fleet', index: int) -> None:
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._fleet.positions[self._index]
+
+    @property
+    def rotation(self) -> np.ndarray:
+        return self._fleet.rotations[self._index]
+
+    @property
+    def visible(self) -> bool:
+        return self._fleet.is_shown(self._index)
+
+    def visual(self) -> object:
+        """Shows the drone (if not shown yet) and returns its visual-only `Quadcopter` (valid until hidden).
+        """
+        return self._fleet.show([self._index])[0]
+
+    def camera(self) -> object:
+        """Shows the drone (if not shown yet) and returns its body-mounted `PerspectiveCamera` (valid until hidden).
+        """
+        return self.visual().camera
+
+    def get_pose(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.position.copy(), self.rotation.copy()
+
+    def scan(self, lidar: Lidar) -> np.ndarray:
+        return lidar.scan(self.position[np.newaxis], self.rotation[np.newaxis])[0]
+
+    def __repr__(self) -> str:
+        return f'Drone(index={self._index})'
+
+
+class Fleet:
+    def __init__(
+            self,
+            positions: Iterable,
+            rotations: Iterable = None,
+            mode: str = 'primitive',
+            seed: int = None
+            ) -> None:
+        """Compact fleet of quadcopters whose states are stored as arrays and advanced by a single shared physics
+        client. Drones are accessed through `Drone` handles (`fleet[i]`); graphics (bodies, rotors and cameras) are
+        only created for drones that are shown, e.g. those in view of a camera, and released when they are hidden.
+
+        Args:
+            positions (Iterable): Positions of quadcopters as a matrix of shape (num_drones, 3).
+            rotations (Iterable): Rotations of quadcopters as a quaternion matrix of shape (num_drones, 4).
+                                  Defaults to the identity rotation.
+            mode (str):           Dynamics backend registered in `pyuav.backends.DYNAMICS`; 'pyflyt' or 'primitive' (default).
+            seed (int, optional): Seed of the physics backend's random number generator (for reproducible runs).
+        """
+        positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        num_drones = len(positions)
+        if rotations is None:
+            rotations = np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (num_drones, 1))
+        rotations = np.array(rotations, dtype=np.float32).reshape(num_drones, 4)
+
+        self._num_drones = num_drones
+        self._positions = positions
+        self._rotations = rotations
+        self._time = 0.0
+        self._physics_client = DYNAMICS.create(mode, num_drones=num_drones, positions=positions, rotations=rotations, seed=seed)
+
+        # Visual-only quadcopters of shown drones by index, and the scene they were added to
+        self._visuals = {}
+        self._scene = None
+        LOGGER.info(f'Fleet.__init__() :: Initialized {num_drones} drones')
+
+    @property
+    def num_drones(self) -> int:
+        return self._num_drones
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions
+
+    @property
+    def rotations(self) -> np.ndarray:
+        return self._rotations
+
+    @property
+    def visible(self) -> list[int]:
+        return list(self._visuals)
+
+    def is_shown(self, index: int) -> bool:
+        return index in self._visuals
+
+    def __len__(self) -> int:
+        return self._num_drones
+
+    def __getitem__(self, index: int) -> Drone:
+        if not -self._num_drones <= index < self._num_drones:
+            raise IndexError(f'drone index {index} out of range')
+        return Drone(self, index % self._num_drones)
+
+    def __iter__(self) -> Iterable[Drone]:
+        return (Drone(self, i) for i in range(self._num_drones))
+
+    def control(self, targets: np.ndarray, headings: Iterable[float], dt: float = 0.05) -> None:
+        """Advances all drones towards their targets in a single batched step.
+
+        Args:
+            targets (np.ndarray): Target positions of shape (num_drones, 3).
+            headings (Iterable):  Desired headings (in radians) of shape (num_drones,).
+            dt (float):           Time step in seconds (PyFlyt advances by its own fixed control period instead).
+        """
+        self._positions, self._rotations = self._physics_client.control_all(targets=targets, headings=headings, dt=dt)
+        self._time += dt
+        self._update_visuals()
+
+    def get_pose(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._positions, self._rotations
+
+    def scan(self, lidar: Lidar) -> np.ndarray:
+        """Measures ranges of all drones with body-mounted lidars in one batched call (see `pyuav.sensors.Lidar`).
+
+        Returns:
+            np.ndarray: Ranges of shape (num_drones, vertical_beams, horizontal_beams).
+        """
+        return lidar.scan(self._positions, self._rotations)
+
+    def attach(self, scene: object) -> None:
+        """Sets the `Scene` visuals of shown drones are added to (moving those already shown).
+        """
+        for visual in self._visuals.values():
+            if self._scene is not None:
+                self._scene.remove(visual.body_and_rotors)
+            scene.add(visual.body_and_rotors)
+        self._scene = scene
+
+    def show(self, indices: Iterable[int]) -> list[object]:
+        """Creates graphics for drones (if not shown yet) and adds them to the attached scene.
+
+        Args:
+            indices (Iterable): Indices of drones to show.
+
+        Returns:
+            list[Quadcopter]: Visual-only quadcopters of the drones.
+        """
+        from pyuav.entities import Quadcopter
+
+        visuals = []
+        for index in np.atleast_1d(indices).tolist():
+            visual = self._visuals.get(index)
+            if visual is None:
+                visual = Quadcopter(position=self._positions[index], rotation=self._rotations[index], mode=None)
+                visual.set_time(self._time)
+                self._visuals[index] = visual
+                if self._scene is not None:
+                    self._scene.add(visual.body_and_rotors)
+                PROFILER.count('fleet.shown')
+            visuals.append(visual)
+        return visuals
+
+    def hide(self, indices: Iterable[int]) -> None:
+        """Removes drones from the attached scene and releases their graphics (and cameras).
+        """
+        for index in np.atleast_1d(indices).tolist():
+            visual = self._visuals.pop(index, None)
+            if visual is None:
+                continue
+            if self._scene is not None:
+                self._scene.remove(visual.body_and_rotors)
+            visual.release()
+            PROFILER.count('fleet.hidden')
+
+    def in_view(self, camera: object, max_distance: float = 100.0) -> np.ndarray:
+        """Finds the drones within `max_distance` of a camera whose bounding spheres intersect its view cone.
+
+        Args:
+            camera (PerspectiveCamera): Camera to test against.
+            max_distance (float):       Distance beyond which drones are not considered visible.
+
+        Returns:
+            np.ndarray: Indices of drones in view.
+        """
+        instance = camera.get_instance()
+        origin = np.asarray(instance.world.position, dtype=np.float32)
+        forward = rotate_vectors(instance.world.rotation, np.array([[0, 0, -1]], dtype=np.float32))[0, 0]
+
+        # Half-angle of the cone around the view frustum (through its corners)
+        aspect = getattr(instance, 'aspect', 1.0)
+        half_angle = np.arctan(np.tan(np.radians(instance.fov) / 2) * np.sqrt(1 + aspect ** 2))
+
+        offsets = self._positions - origin
+        distances = np.linalg.norm(offsets, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            angles = np.arccos(np.clip(offsets @ forward / distances, -1, 1))
+            margins = np.arcsin(np.clip(DRONE_RADIUS / distances, 0, 1))
+        visible = (distances <= max_distance) & ((distances <= DRONE_RADIUS) | (angles <= half_angle + margins))
+        return np.flatnonzero(visible)
+
+    def update_visible(self, camera: object, max_distance: float = 100.0, keep: Iterable[int] = ()) -> None:
+        """Shows the drones in view of a camera and hides all others (except those in `keep`, e.g. drones
+        whose cameras are observed).
+
+        Args:
+            camera (PerspectiveCamera): Camera the scene is rendered from.
+            max_distance (float):       Distance beyond which drones are hidden.
+            keep (Iterable):            Indices of drones that are never hidden.
+        """
+        shown = set(self.in_view(camera, max_distance).tolist()) | set(keep)
+        self.hide([index for index in self._visuals if index not in shown])
+        self.show(sorted(shown))
+
+    def _update_visuals(self) -> None:
+        if not self._visuals:
+            return
+        start = PROFILER.start()
+        for index, visual in self._visuals.items():
+            visual.set_pose(self._positions[index], self._rotations[index])
+            visual.set_time(self._time)
+        PROFILER.stop('transforms.fleet', start)
@@ -0,0 +1,99 @@
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class AssetCache:
+    """Process-wide least-recently-used cache of GPU resources (geometries, textures, materials)
+    shared between all entities in a scene.
+    """
+    def __init__(self, max_size: int = 256) -> None:
+        """Initializes cache.
+
+        Args:
+            max_size (int): Maximum number of assets kept in the cache before evicting the least-recently-used one.
+        """
+        assert max_size > 0, 'Cache size must be positive'
+        self._max_size = max_size
+        self._items = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        assert max_size > 0, 'Cache size must be positive'
+        self._max_size = max_size
+        self._evict()
+
+    @property
+    def stats(self) -> dict:
+        return dict(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._items),
+            max_size=self._max_size
+            )
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Returns asset stored under `key`, calling `loader` to create it on a miss.
+
+        Args:
+            key (Hashable):     Key identifying the asset (see `file_key`).
+            loader (Callable):  Function without arguments that creates the asset.
+
+        Returns:
+            Any: Cached asset.
+        """
+        if key in self._items:
+            self._hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+        self._misses += 1
+        asset = loader()
+        self._items[key] = asset
+        self._evict()
+        return asset
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict(self) -> None:
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+            self._evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def file_key(kind: str, file_path: str, *params: Hashable) -> tuple:
+    """Creates a cache key for a file-backed asset. Including the modification time ensures
+    that a stale asset is never returned after the file on disk changes.
+
+    Args:
+        kind (str):      Type of asset, e.g. 'geometry' or 'texture'.
+        file_path (str): Path to source file.
+        params:          Additional (hashable) parameters the asset was created with.
+
+    Returns:
+        tuple: Cache key.
+    """
+    file_path = os.path.abspath(file_path)
+    return (kind, file_path, os.path.getmtime(file_path)) + params
+
+
+# Cache shared by all meshes and materials in this process
+ASSET_CACHE = AssetCache()
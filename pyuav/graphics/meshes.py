@@ -1,10 +1,152 @@
 import os
+import sys
+import json
+import shutil
+import weakref
+import tempfile
 import trimesh
 import pygfx as gfx
 import numpy as np
 import pylinalg as la
 import imageio.v3 as iio
 from pyuav.graphics.datatypes import *
+from pyuav.graphics.assets import ASSET_CACHE, file_key
+from pyuav.profiling import LOGGER, PROFILER
+
+
+def load_image(file_path: str) -> np.ndarray:
+    """Decodes image file into a compact RGBA uint8 array of shape (height, width, 4).
+    """
+    image = iio.imread(file_path)
+
+    # Rescale higher bit-depth images to 8 bits
+    if image.dtype != np.uint8:
+        max_value = np.iinfo(image.dtype).max if np.issubdtype(image.dtype, np.integer) else 1.0
+        image = np.clip(image / max_value * 255 + 0.5, 0, 255).astype(np.uint8)
+
+    # Expand grayscale and RGB images to RGBA (wgpu has no 3-channel 8-bit formats)
+    if image.ndim == 2:
+        image = image[..., np.newaxis]
+    if image.shape[-1] < 3:
+        image = np.repeat(image[..., :1], 3, axis=-1)
+    if image.shape[-1] == 3:
+        alpha = np.full(image.shape[:2] + (1,), 255, dtype=np.uint8)
+        image = np.concatenate([image, alpha], axis=-1)
+
+    return np.ascontiguousarray(image)
+
+
+# Binary asset cache (bump version whenever the layout of compiled assets changes)
+ASSET_FORMAT_VERSION = 1
+ASSET_CACHE_SUFFIX = '.pyuav-cache'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tga', '.tif', '.tiff')
+GEOMETRY_ATTRIBUTES = ('positions', 'indices', 'normals', 'texcoords', 'colors')
+
+
+def _source_meta(file_path: str) -> dict:
+    stat = os.stat(file_path)
+    return dict(version=ASSET_FORMAT_VERSION, mtime=stat.st_mtime, size=stat.st_size)
+
+
+def _parse_asset(file_path: str) -> dict[str, np.ndarray]:
+    if file_path.lower().endswith(IMAGE_EXTENSIONS):
+        return dict(image=load_image(file_path))
+    
+    # Let PyGFX convert the mesh so compiled arrays follow its conventions (e.g. UV orientation)
+    geometry = gfx.geometry_from_trimesh(trimesh.load(file_path))
+    arrays = {}
+    for name in GEOMETRY_ATTRIBUTES:
+        buffer = getattr(geometry, name, None)
+        if buffer is not None:
+            arrays[name] = np.ascontiguousarray(buffer.data)
+    return arrays
+
+
+def _read_meta(cache_dir: str) -> dict:
+    """Returns the metadata of a cache directory, or None if it is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_compiled(file_path: str) -> bool:
+    """Checks whether an up-to-date binary cache exists for an asset.
+    """
+    meta = _read_meta(file_path + ASSET_CACHE_SUFFIX)
+    if meta is None:
+        return False
+    return all(meta.get(k) == v for k, v in _source_meta(file_path).items())
+
+
+def compile_asset(file_path: str) -> str:
+    """Parses a 3D model or image file once and writes its arrays (vertices, indices, normals, 
+    UVs or decoded RGBA pixels) as .npy files to a versioned cache directory next to the source.
+
+    The cache is written to a temporary directory that is then moved into place, so that processes loading the
+    asset concurrently never see a partially written cache and arrays they memory-mapped are never overwritten.
+
+    Args:
+        file_path (str): Path to source asset.
+
+    Returns:
+        str: Path to cache directory.
+    """
+    assert os.path.isfile(file_path), f"Asset file '{file_path}' does not exist"
+    cache_dir = file_path + ASSET_CACHE_SUFFIX
+    temp_dir = tempfile.mkdtemp(prefix=os.path.basename(cache_dir) + '.', dir=os.path.dirname(os.path.abspath(file_path)))
+    try:
+        arrays = _parse_asset(file_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_dir, f'{name}.npy'), array)
+        with open(os.path.join(temp_dir, 'meta.json'), 'w') as f:
+            json.dump(dict(_source_meta(file_path), arrays=list(arrays)), f)
+
+        # Directories cannot be replaced while not empty, so a stale cache is moved aside first
+        stale_dir = temp_dir + '.stale'
+        try:
+            os.rename(cache_dir, stale_dir)
+        except FileNotFoundError:
+            stale_dir = None
+        try:
+            os.rename(temp_dir, cache_dir)
+        except OSError:
+            # Another process moved its (equally valid) cache into place first
+            pass
+        if stale_dir is not None:
+            shutil.rmtree(stale_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    LOGGER.info(f'compile_asset() :: compiled {file_path}')
+    return cache_dir
+
+
+def load_asset(file_path: str) -> dict[str, np.ndarray]:
+    """Loads arrays of an asset from its binary cache as memory-maps, (re)compiling 
+    the cache first if it is missing or older than the source file.
+
+    Args:
+        file_path (str): Path to source asset.
+
+    Returns:
+        dict[str, np.ndarray]: Arrays by name, e.g. 'positions', 'indices', 'normals', 'texcoords' or 'image'.
+    """
+    assert os.path.isfile(file_path), f"Asset file '{file_path}' does not exist"
+    cache_dir = file_path + ASSET_CACHE_SUFFIX
+    try:
+        if not is_compiled(file_path):
+            compile_asset(file_path)
+        meta = _read_meta(cache_dir)
+        if meta is None:
+            raise FileNotFoundError(f"Asset cache '{cache_dir}' is missing")
+        return {name: np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r') for name in meta['arrays']}
+    except OSError:
+        # Cache cannot be written (e.g. read-only install) or was replaced by another process while loading;
+        # parse source instead
+        return _parse_asset(file_path)
 
 
 class Material(GfxObject):
@@ -14,28 +156,227 @@ class Material(GfxObject):
             shininess: float = 30, 
             diffuse: str = "#000",
             emissive: str = "#000",
-            specular: str = "#494949"
+            specular: str = "#494949",
+            mipmaps: bool = False,
+            pick_write: bool = True
             ) -> None:
+        """Phong material with either a texture or a solid diffuse color.
 
+        Args:
+            tex_file (str, optional): Path to texture image.
+            shininess (float):        Shininess of specular highlights.
+            diffuse (str):            Diffuse color (only used without texture).
+            emissive (str):           Emissive color.
+            specular (str):           Specular color.
+            mipmaps (bool):           Whether to generate mipmaps for the texture (reduces aliasing of distant objects).
+            pick_write (bool):        Whether meshes with this material are written to the instance-segmentation output.
+        """
+        # Materials with identical parameters are shared between meshes
         if tex_file is not None:
-            self._instance = gfx.MeshPhongMaterial(
-                map=self._load_texture(tex_file),
+            assert os.path.isfile(tex_file), f"Texture file '{tex_file}' does not exist"
+            key = file_key('material', tex_file, shininess, emissive, specular, mipmaps, pick_write)
+            self._instance = ASSET_CACHE.get(key, lambda: gfx.MeshPhongMaterial(
+                map=self._load_texture(tex_file, mipmaps),
                 shininess=shininess,
                 emissive=emissive,
-                specular=specular
-                )
+                specular=specular,
+                pick_write=pick_write
+                ))
         else:
-            self._instance = gfx.MeshPhongMaterial(
+            key = ('material', diffuse, shininess, emissive, specular, pick_write)
+            self._instance = ASSET_CACHE.get(key, lambda: gfx.MeshPhongMaterial(
                 color=diffuse,
                 shininess=shininess,
                 emissive=emissive,
-                specular=specular
-            )
+                specular=specular,
+                pick_write=pick_write
+            ))
 
-    def _load_texture(self, file_path: str) -> gfx.Texture:
+    def _load_texture(self, file_path: str, mipmaps: bool = False) -> gfx.Texture:
         assert os.path.isfile(file_path), f"Texture file '{file_path}' does not exist"
-        image = iio.imread(file_path).astype("float32") / 255
-        return gfx.Texture(image, dim=2)
+
+        # Decoded images are shared by all textures created from the same file
+        image = ASSET_CACHE.get(file_key('image', file_path), lambda: load_asset(file_path)['image'])
+
+        # Upload as uint8 in sRGB colorspace, i.e. as rgba8unorm-srgb texture
+        return ASSET_CACHE.get(
+            file_key('texture', file_path, mipmaps), 
+            lambda: gfx.Texture(image, dim=2, colorspace="srgb", generate_mipmaps=mipmaps)
+            )
+
+
+def decimate_geometry(arrays: dict[str, np.ndarray], ratio: float) -> dict[str, np.ndarray]:
+    """Simplifies geometry arrays by vertex clustering: vertices are snapped to the coarsest uniform grid
+    that keeps at least `ratio` of them, merged per cell, and triangles that collapse are removed.
+
+    Args:
+        arrays (dict): Geometry arrays by name (see `load_asset`); 'positions' and 'indices' are required.
+        ratio (float): Approximate fraction of vertices to keep, in (0, 1].
+
+    Returns:
+        dict[str, np.ndarray]: Decimated geometry arrays.
+    """
+    assert 0 < ratio <= 1, 'Decimation ratio must be in (0, 1]'
+    positions = np.asarray(arrays['positions'], dtype=np.float32)
+    indices = np.asarray(arrays['indices'])
+    target = max(int(len(positions) * ratio), 3)
+
+    low = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - low, 1e-6)
+
+    def cluster(resolution: int) -> tuple[np.ndarray, np.ndarray]:
+        cells = np.minimum(((positions - low) / extent * resolution).astype(np.int64), resolution - 1)
+        keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        return first, inverse.ravel()
+
+    # Binary search for the finest grid that does not exceed the target vertex count
+    lo, hi = 1, 1024
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if len(cluster(mid)[0]) <= target:
+            lo = mid
+        else:
+            hi = mid - 1
+    first, inverse = cluster(lo)
+
+    # Merged vertices are placed at the centroid of their cell; other attributes are taken from one of its vertices
+    counts = np.bincount(inverse, minlength=len(first)).astype(np.float32)[:, np.newaxis]
+    centroids = np.stack([np.bincount(inverse, weights=positions[:, i], minlength=len(first)) for i in range(3)], axis=-1)
+    result = {name: np.ascontiguousarray(np.asarray(array)[first]) for name, array in arrays.items() if name not in ('positions', 'indices')}
+    result['positions'] = (centroids / counts).astype(np.float32)
+
+    triangles = inverse[indices.reshape(-1, 3)]
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    result['indices'] = np.ascontiguousarray(triangles[keep].astype(indices.dtype).reshape((-1,) + indices.shape[1:]))
+    return result
+
+
+def load_geometry(file_path: str, ratio: float = 1.0) -> gfx.Geometry:
+    """Returns (shared) GPU geometry of a 3D model file, decimated to approximately `ratio` of its vertices if below 1.
+    """
+    assert os.path.isfile(file_path), f"3D model file '{file_path}' does not exist"
+    if ratio < 1:
+        return ASSET_CACHE.get(
+            file_key('geometry', file_path, ratio), 
+            lambda: gfx.Geometry(**decimate_geometry(load_asset(file_path), ratio))
+            )
+    return ASSET_CACHE.get(file_key('geometry', file_path), lambda: gfx.Geometry(**load_asset(file_path)))
+
+
+def merge_meshes(meshes: Iterable[gfx.Mesh]) -> gfx.Mesh:
+    """Merges PyGFX meshes sharing a material into a single mesh by baking their world matrices into
+    one combined geometry. Only attributes present in all meshes are kept.
+
+    Args:
+        meshes (Iterable): PyGFX meshes with the same material.
+
+    Returns:
+        gfx.Mesh: Combined mesh (with identity transform), casting/receiving shadows like the first mesh.
+    """
+    meshes = list(meshes)
+    names = [name for name in GEOMETRY_ATTRIBUTES if all(getattr(mesh.geometry, name, None) is not None for mesh in meshes)]
+    assert 'positions' in names and 'indices' in names, 'Merged meshes require positions and indices'
+
+    arrays = {name: [] for name in names}
+    offset = 0
+    for mesh in meshes:
+        matrix = mesh.world.matrix
+        for name in names:
+            data = np.asarray(getattr(mesh.geometry, name).data)
+            if name == 'positions':
+                data = data @ matrix[:3, :3].T + matrix[:3, 3]
+            elif name == 'normals':
+                data = data @ np.linalg.inv(matrix[:3, :3])
+                data = data / np.maximum(np.linalg.norm(data, axis=-1, keepdims=True), 1e-12)
+            elif name == 'indices':
+                data = data + offset
+            arrays[name].append(data.astype(np.float32) if name != 'indices' else data.astype(np.uint32))
+        offset += len(mesh.geometry.positions.data)
+
+    first = meshes[0]
+    return gfx.Mesh(
+        geometry=gfx.Geometry(**{name: np.ascontiguousarray(np.concatenate(parts)) for name, parts in arrays.items()}),
+        material=first.material,
+        cast_shadow=first.cast_shadow,
+        receive_shadow=first.receive_shadow
+    )
+
+
+# Instance IDs of meshes by PyGFX pick id (0 is reserved for the background and objects without ID)
+_INSTANCE_IDS = {}
+_INSTANCE_LUT = None
+_MAX_INSTANCE_ID = 0
+
+
+def _pick_ids(obj: gfx.WorldObject) -> list[int]:
+    """Returns the ids a PyGFX object writes to the pick target: its object id, or one id per instance of instanced objects.
+    """
+    if isinstance(obj, gfx.InstancedMesh):
+        return obj.instance_buffer.data['global_id'].tolist()
+    return [obj.id]
+
+
+def _forget_pick_ids(pick_ids: list[int]) -> None:
+    global _INSTANCE_LUT
+    for pick_id in pick_ids:
+        _INSTANCE_IDS.pop(pick_id, None)
+    _INSTANCE_LUT = None
+
+
+def register_instance_id(obj: gfx.WorldObject, instance_id: int = None) -> int:
+    """Assigns an instance ID to a PyGFX object (and all its instances), by default the next free ID in order
+    of creation (so IDs are stable between runs that build the scene in the same order). The ID is unregistered
+    when the object is garbage collected, as PyGFX reuses the ids of collected objects.
+    """
+    global _INSTANCE_LUT, _MAX_INSTANCE_ID
+    if instance_id is None:
+        instance_id = _MAX_INSTANCE_ID + 1
+    assert instance_id > 0, 'Instance ID 0 is reserved for the background'
+    pick_ids = _pick_ids(obj)
+    for pick_id in pick_ids:
+        _INSTANCE_IDS[pick_id] = instance_id
+    _INSTANCE_LUT = None
+    _MAX_INSTANCE_ID = max(_MAX_INSTANCE_ID, instance_id)
+    weakref.finalize(obj, _forget_pick_ids, pick_ids)
+    return instance_id
+
+
+def unregister_instance_id(obj: gfx.WorldObject) -> None:
+    """Removes the instance ID of a PyGFX object, e.g. once it is released.
+    """
+    _forget_pick_ids(_pick_ids(obj))
+
+
+def instance_id_lut() -> np.ndarray:
+    """Returns lookup table mapping PyGFX pick ids to instance IDs (0 for objects without instance ID).
+    """
+    global _INSTANCE_LUT
+    if _INSTANCE_LUT is None:
+        _INSTANCE_LUT = np.zeros(max(_INSTANCE_IDS, default=0) + 1, dtype=np.uint32)
+        _INSTANCE_LUT[list(_INSTANCE_IDS)] = list(_INSTANCE_IDS.values())
+    return _INSTANCE_LUT
+
+
+def compose_matrices(positions: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    """Composes batches of positions (N, 3) and (x, y, z, w) quaternions (N, 4) into affine matrices of shape (N, 4, 4).
+    """
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    x, y, z, w = np.asarray(rotations, dtype=np.float32).reshape(-1, 4).T
+
+    matrices = np.zeros((len(positions), 4, 4), dtype=np.float32)
+    matrices[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[:, 0, 1] = 2 * (x * y - z * w)
+    matrices[:, 0, 2] = 2 * (x * z + y * w)
+    matrices[:, 1, 0] = 2 * (x * y + z * w)
+    matrices[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[:, 1, 2] = 2 * (y * z - x * w)
+    matrices[:, 2, 0] = 2 * (x * z - y * w)
+    matrices[:, 2, 1] = 2 * (y * z + x * w)
+    matrices[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    matrices[:, :3, 3] = positions
+    matrices[:, 3, 3] = 1
+    return matrices
 
 
 class Mesh(GfxObject):
@@ -45,17 +386,53 @@ class Mesh(GfxObject):
             material: Material,
             position: Vector3f = (0, 0, 0),
             rotation: Quaternion = (0, 0, 0, 1),
-            parent: GfxObject = None
+            parent: GfxObject = None,
+            lod_ratios: Iterable[float] = (),
+            lod_screen_sizes: Iterable[float] = (),
+            instance_id: int = None,
+            static: bool = False,
+            cast_shadow: bool = False,
+            receive_shadow: bool = False
             ) -> None:
-        assert os.path.isfile(file_path), f"3D model file '{file_path}' does not exist"
+        """Mesh loaded from a 3D model file, with optional distance-based level-of-detail (LOD).
+
+        Args:
+            file_path (str):             Path to 3D model file.
+            material (Material):         Material of the mesh.
+            position (Vector3f):         Initial (local) position.
+            rotation (Quaternion):       Initial (local) rotation.
+            parent (GfxObject):          Object to parent mesh to.
+            lod_ratios (Iterable):       Fractions of vertices kept by each decimated LOD level, e.g. (0.25, 0.05).
+            lod_screen_sizes (Iterable): Projected sizes (as fraction of the view height) below which each LOD level 
+                                         is drawn, in decreasing order, e.g. (0.5, 0.1).
+            instance_id (int, optional): ID of the mesh in instance-segmentation outputs (default: next free ID).
+            static (bool):               Whether the mesh never moves once added to a `Scene`. Static meshes sharing a material
+                                         are merged into a single draw and their shadows are cached (see `Scene`).
+            cast_shadow (bool):          Whether the mesh casts shadows of lights with `cast_shadow=True`.
+            receive_shadow (bool):       Whether shadows are drawn onto the mesh.
+        """
+        lod_ratios, lod_screen_sizes = tuple(lod_ratios), tuple(lod_screen_sizes)
+        assert len(lod_ratios) == len(lod_screen_sizes), 'Each LOD level requires a ratio and a screen size'
+        assert list(lod_screen_sizes) == sorted(lod_screen_sizes, reverse=True), 'LOD screen sizes must be decreasing'
 
-        # Create mesh object with material
+        # Create mesh object with material (geometry is shared between meshes loading the same file)
+        self._lods = [load_geometry(file_path, ratio) for ratio in (1.0,) + lod_ratios]
+        self._lod_screen_sizes = np.array(lod_screen_sizes, dtype=np.float32)
+        self._lod = 0
         self._instance = gfx.Mesh(
-            geometry=gfx.geometry_from_trimesh(
-                trimesh.load(file_path)
-            ),
-            material=material.get_instance()
+            geometry=self._lods[0],
+            material=material.get_instance(),
+            cast_shadow=cast_shadow,
+            receive_shadow=receive_shadow
         )
+        self._instance_id = register_instance_id(self._instance, instance_id)
+        self._static = static
+
+        # Bounding sphere of the full geometry (in local coordinates) to estimate projected size
+        if lod_ratios:
+            vertices = np.asarray(self._lods[0].positions.data)
+            self._center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+            self._radius = float(np.linalg.norm(vertices - self._center, axis=-1).max())
 
         # [Optional] Parent to other object
         if parent is not None:
@@ -64,7 +441,54 @@ class Mesh(GfxObject):
         # Set initial pose
         self.set_position(position, mode='local')
         self.set_rotation(rotation, mode='local')
-        print(f'Mesh.__init__() :: loaded {file_path}')
+        PROFILER.count('meshes_loaded')
+        LOGGER.info(f'Mesh.__init__() :: loaded {file_path}')
+
+    @property
+    def instance_id(self) -> int:
+        return self._instance_id
+
+    @property
+    def geometry(self) -> gfx.Geometry:
+        """Full-detail geometry (regardless of the LOD level drawn).
+        """
+        return self._lods[0]
+
+    @property
+    def static(self) -> bool:
+        return self._static
+
+    @property
+    def lod(self) -> int:
+        return self._lod
+
+    @property
+    def num_lods(self) -> int:
+        return len(self._lods)
+
+    def update_lod(self, camera: GfxObject) -> int:
+        """Selects the LOD level drawn from the size of the mesh projected onto the camera's view.
+
+        Args:
+            camera (GfxObject): Perspective camera used for rendering.
+
+        Returns:
+            int: Selected LOD level (0 is the full geometry).
+        """
+        if len(self._lods) == 1:
+            return 0
+
+        camera = camera.get_instance()
+        center = la.vec_transform(self._center, self._instance.world.matrix)
+        distance = np.linalg.norm(center - camera.world.position)
+        radius = self._radius * np.max(np.abs(self._instance.world.scale))
+        size = radius / max(distance * np.tan(np.radians(camera.fov) / 2), 1e-6)
+
+        lod = int(np.sum(size < self._lod_screen_sizes))
+        if lod != self._lod:
+            self._instance.geometry = self._lods[lod]
+            self._lod = lod
+        return lod
 
     def parent_to(self, mesh: GfxObject) -> None:
         mesh.get_instance().add(self._instance, keep_world_matrix=False)
@@ -98,4 +522,69 @@ class Mesh(GfxObject):
         if mode == 'world':
             return self._instance.world.rotation
         else:
-            return self._instance.local.rotation
\ No newline at end of file
+            return self._instance.local.rotation
+
+
+class InstancedMesh(GfxObject):
+    def __init__(
+            self, 
+            file_path: str, 
+            material: Material,
+            count: int,
+            instance_id: int = None
+            ) -> None:
+        """Draws `count` copies of a 3D model in a single draw call, each with its own world matrix.
+
+        Args:
+            file_path (str):     Path to 3D model file.
+            material (Material): Material shared by all instances.
+            count (int):         Number of instances.
+            instance_id (int, optional): ID of all instances in instance-segmentation outputs (default: next free ID).
+        """
+        self._count = count
+        self._instance = gfx.InstancedMesh(
+            geometry=load_geometry(file_path),
+            material=material.get_instance(),
+            count=count
+        )
+        self._instance_id = register_instance_id(self._instance, instance_id)
+        PROFILER.count('meshes_loaded')
+        LOGGER.info(f'InstancedMesh.__init__() :: loaded {file_path} ({count} instances)')
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def instance_id(self) -> int:
+        return self._instance_id
+
+    def set_matrices(self, matrices: np.ndarray) -> None:
+        """Overwrites the matrices of all instances at once.
+
+        Args:
+            matrices (np.ndarray): Affine (row-major) matrices of shape (count, 4, 4).
+        """
+        start = PROFILER.start()
+        buffer = self._instance.instance_buffer
+        buffer.data["matrix"][:] = np.swapaxes(matrices, 1, 2) # stored column-major
+        buffer.update_range(0, self._count)
+        PROFILER.stop('transforms.instances', start)
+
+    def set_poses(self, positions: np.ndarray, rotations: np.ndarray) -> None:
+        """Overwrites the poses of all instances at once.
+
+        Args:
+            positions (np.ndarray): Positions of shape (count, 3).
+            rotations (np.ndarray): Quaternions of shape (count, 4).
+        """
+        self.set_matrices(compose_matrices(positions, rotations))
+
+
+if __name__ == '__main__':
+    # Precompile all assets below the given directories (default: ./assets)
+    for root_dir in sys.argv[1:] or ['assets']:
+        for dir_path, _, file_names in os.walk(root_dir):
+            for file_name in file_names:
+                if file_name.lower().endswith(IMAGE_EXTENSIONS + ('.obj', '.stl', '.ply', '.glb', '.gltf')):
+                    compile_asset(os.path.join(dir_path, file_name))
@@ -1,17 +1,129 @@
+import wgpu
 import numpy as np
 import pygfx as gfx
+from collections import deque
+from typing import Union
 from pyuav.graphics.datatypes import *
+from pyuav.graphics.meshes import instance_id_lut, merge_meshes, register_instance_id
+from pyuav.graphics.transforms import TRANSFORMS
+from pyuav.profiling import LOGGER, PROFILER
 from wgpu.gui.offscreen import WgpuCanvas
 
 
 class Scene(GfxObject):
     def __init__(self, *objs: tuple[GfxObject]) -> None:
+        """Scene graph of objects to render.
+
+        Static meshes (`Mesh(static=True)`) are batched when the scene is first rendered: meshes with the same material
+        (and without LOD levels) are merged into a single draw. Shadow maps are only re-rendered when the lights or static
+        meshes change, as long as all shadow casters are static. Call `invalidate_static()` after moving a static mesh.
+        """
         self._instance = gfx.Scene()
+        self._lod_objs = []
+
+        # Static meshes and the batches they are drawn with (built on first render)
+        self._static_objs = []
+        self._static_batches = []
+        self._static_dirty = False
+
+        # Shadow casters and the light poses the shadow maps were last rendered for
+        self._lights = []
+        self._static_casters = []
+        self._dynamic_casters = False
+        self._shadow_key = None
+
         for obj in objs:
             self.add(obj)
 
     def add(self, obj: GfxObject) -> None:
-        self._instance.add(obj.get_instance())
+        if getattr(obj, 'static', False):
+            self._static_objs.append(obj)
+            self._static_dirty = True
+        else:
+            self._instance.add(obj.get_instance())
+            self._shadow_key = None
+
+        # Objects with multiple levels-of-detail (e.g. `Mesh`) are updated before each render
+        if getattr(obj, 'num_lods', 1) > 1:
+            self._lod_objs.append(obj)
+
+    def remove(self, obj: GfxObject) -> None:
+        if obj in self._static_objs:
+            self._static_objs.remove(obj)
+            self._static_dirty = True
+        else:
+            self._instance.remove(obj.get_instance())
+            self._shadow_key = None
+        if obj in self._lod_objs:
+            self._lod_objs.remove(obj)
+
+    def invalidate_static(self) -> None:
+        """Rebuilds static batches and shadow maps on the next render (e.g. after a static mesh was moved).
+        """
+        self._static_dirty = True
+
+    def _build_static(self) -> None:
+        for batch in self._static_batches:
+            self._instance.remove(batch)
+
+        # Group meshes by material and shadow settings; meshes with LOD levels are drawn individually
+        groups = {}
+        for obj in self._static_objs:
+            instance = obj.get_instance()
+            if obj.num_lods > 1:
+                groups[id(instance)] = [obj]
+            else:
+                groups.setdefault((id(instance.material), instance.cast_shadow, instance.receive_shadow), []).append(obj)
+
+        # Merged batches are reported with the instance ID of their first mesh in instance outputs
+        self._static_batches = []
+        for objs in groups.values():
+            if len(objs) == 1:
+                batch = objs[0].get_instance()
+            else:
+                batch = merge_meshes([obj.get_instance() for obj in objs])
+                register_instance_id(batch, objs[0].instance_id)
+            self._instance.add(batch)
+            self._static_batches.append(batch)
+
+        self._static_casters = [batch for batch in self._static_batches if batch.cast_shadow]
+        self._static_dirty = False
+        self._shadow_key = None
+        LOGGER.info(f'Scene._build_static() :: {len(self._static_objs)} static meshes in {len(self._static_batches)} draws')
+
+    def _scan_shadows(self) -> None:
+        objs = []
+        self._instance.traverse(lambda obj: objs.append(obj))
+        static = {batch.id for batch in self._static_casters}
+        self._lights = [obj for obj in objs if isinstance(obj, gfx.Light) and obj.cast_shadow]
+        self._dynamic_casters = any(obj.cast_shadow and obj.geometry is not None and obj.id not in static for obj in objs)
+
+    def update_static(self) -> None:
+        """Builds static batches if needed and decides whether shadow maps must be re-rendered: static casters
+        are hidden from the shadow pass while the maps rendered before are still valid (the pass is then skipped).
+        """
+        if self._static_dirty:
+            self._build_static()
+
+        if self._shadow_key is None:
+            self._scan_shadows()
+
+        # Shadow maps depend on the light poses and the geometries (LOD levels) of the static casters
+        key = b''.join(light.world.matrix.tobytes() + light.target.world.position.tobytes() if hasattr(light, 'target')
+                       else light.world.matrix.tobytes() for light in self._lights)
+        key += np.array([id(batch.geometry) for batch in self._static_casters], dtype=np.int64).tobytes()
+        reuse = not self._dynamic_casters and key == self._shadow_key
+        for batch in self._static_casters:
+            batch.cast_shadow = not reuse
+        if reuse:
+            PROFILER.count('shadow_maps_reused')
+        self._shadow_key = key
+
+    def update_lod(self, camera: GfxObject) -> None:
+        """Selects the level-of-detail of all (directly added) objects for rendering from `camera`.
+        """
+        for obj in self._lod_objs:
+            obj.update_lod(camera)
 
 
 class Axes(GfxObject):
@@ -75,32 +187,489 @@ class PerspectiveCamera(GfxObject):
             return self._instance.local.rotation
     
 
+def _num_draw_calls(scene: Scene) -> int:
+    """Number of draw calls needed to render a scene (one per visible object with geometry; 0 while profiling is disabled).
+    """
+    if not PROFILER.enabled:
+        return 0
+    objs = []
+    scene.get_instance().traverse(lambda obj: objs.append(obj), skip_invisible=True)
+    return sum(obj.geometry is not None for obj in objs)
+
+
+# Render outputs that can be read back: render target, bytes per pixel and texture aspect
+RENDER_OUTPUTS = {
+    'rgb': ('color', 4, 'all'),
+    'depth': ('depth', 4, 'depth-only'),
+    'instance': ('pick', 8, 'all')
+}
+
+def _render_target(renderer: gfx.renderers.WgpuRenderer, name: str) -> wgpu.GPUTexture:
+    """Returns an internal render target ('color', 'depth' or 'pick') of a PyGFX renderer. PyGFX has no public API
+    for these, so this is the only place its private blender is accessed; the blender's API is detected per version
+    (`get_texture(name)` in recent releases, `<name>_tex` attributes in older ones). After a flush, 'color' is the
+    target holding the result of the post-processing effects (e.g. anti-aliasing), as presented by `render()`.
+    """
+    if name == 'color':
+        name = getattr(renderer, '_name_of_texture_with_effects', None) or 'color'
+    blender = renderer._blender
+    if hasattr(blender, 'get_texture'):
+        texture = blender.get_texture(name)
+    else:
+        texture = getattr(blender, f'{name}_tex', None)
+    if texture is None:
+        raise Exception(f"render target '{name}' not available in PyGFX {gfx.__version__}")
+    return texture
+
+
+def _bytes_per_row(width: int, bytes_per_pixel: int = 4) -> int:
+    # Texture-to-buffer copies require rows aligned to 256 bytes
+    return (bytes_per_pixel * width + 255) // 256 * 256
+
+
+def _encode_copy(
+        encoder: wgpu.GPUCommandEncoder,
+        texture: wgpu.GPUTexture, 
+        buffer: wgpu.GPUBuffer, 
+        origins: list[tuple[int, int]], 
+        width: int, 
+        height: int,
+        bytes_per_pixel: int = 4,
+        offset: int = 0,
+        aspect: str = 'all'
+        ) -> None:
+    bytes_per_row = _bytes_per_row(width, bytes_per_pixel)
+    for i, (x, y) in enumerate(origins):
+        encoder.copy_texture_to_buffer(
+            {"texture": texture, "mip_level": 0, "origin": (x, y, 0), "aspect": aspect},
+            {"buffer": buffer, "offset": offset + i * bytes_per_row * height, "bytes_per_row": bytes_per_row, "rows_per_image": height},
+            (width, height, 1)
+        )
+
+
+def _copy_to_buffer(
+        device: wgpu.GPUDevice, 
+        texture: wgpu.GPUTexture, 
+        buffer: wgpu.GPUBuffer, 
+        origins: list[tuple[int, int]], 
+        width: int, 
+        height: int
+        ) -> None:
+    """Copies (width, height) regions of a texture back-to-back into a buffer using a single submission.
+    """
+    encoder = device.create_command_encoder()
+    _encode_copy(encoder, texture, buffer, origins, width, height)
+    device.queue.submit([encoder.finish()])
+
+
+# Channel order of output pixel formats (indices into RGBA; None for luma)
+PIXEL_FORMATS = {
+    'rgba': (0, 1, 2, 3),
+    'bgra': (2, 1, 0, 3),
+    'rgb': (0, 1, 2),
+    'bgr': (2, 1, 0),
+    'gray': None
+}
+PIXEL_DTYPES = (np.uint8, np.float16)
+GRAY_WEIGHTS = (0.299, 0.587, 0.114)
+
+
+def _convert_pixels(
+        src: np.ndarray, 
+        pixel_format: str = None, 
+        out: np.ndarray = None, 
+        dtype: np.dtype = None, 
+        scratch: dict = None
+        ) -> np.ndarray:
+    """Converts RGBA uint8 pixels of shape (..., 4) into `out` with the channel order of `pixel_format`,
+    as uint8 or as float16 in [0, 1]. Allocates `out` (and the scratch memory of grayscale conversion) only if not given.
+    """
+    pixel_format = pixel_format or 'rgba'
+    if pixel_format not in PIXEL_FORMATS:
+        raise Exception(f"pixel format '{pixel_format}' not understood. Choose from {', '.join(map(repr, PIXEL_FORMATS))}.")
+    channels = PIXEL_FORMATS[pixel_format]
+    shape = src.shape[:-1] if channels is None else src.shape[:-1] + (len(channels),)
+
+    if out is None:
+        out = np.empty(shape, dtype=dtype or np.uint8)
+    assert out.shape == shape, f'Output buffer must have shape {shape}, got {out.shape}'
+    assert out.dtype in PIXEL_DTYPES, f'Output buffer must be uint8 or float16, got {out.dtype}'
+    assert dtype is None or out.dtype == dtype, 'Output buffer does not match dtype'
+    scale = np.float32(1.0 if out.dtype == np.uint8 else 1.0 / 255)
+
+    if channels is not None:
+        for i, c in enumerate(channels):
+            if out.dtype == np.uint8:
+                out[..., i] = src[..., c]
+            else:
+                np.multiply(src[..., c], scale, out=out[..., i], casting='unsafe')
+        return out
+
+    # Weighted sum of RGB accumulated in (reusable) float32 scratch arrays
+    scratch = {} if scratch is None else scratch
+    if scratch.get('gray') is None or scratch['gray'].shape[1:] != shape:
+        scratch['gray'] = np.empty((2,) + shape, dtype=np.float32)
+    acc, tmp = scratch['gray']
+    np.multiply(src[..., 0], np.float32(GRAY_WEIGHTS[0]) * scale, out=acc, casting='unsafe')
+    for c in (1, 2):
+        np.multiply(src[..., c], np.float32(GRAY_WEIGHTS[c]) * scale, out=tmp, casting='unsafe')
+        acc += tmp
+    if out.dtype == np.uint8:
+        acc += 0.5
+    np.copyto(out, acc, casting='unsafe')
+    return out
+
+
+def _decode_output(name: str, rows: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Converts read back rows (height, bytes_per_pixel * width) of uint8 to the array of an output.
+    """
+    if name == 'depth':
+        return rows.view(np.float32).reshape(height, width)
+    if name == 'instance':
+        # Lower 20 bits of the (64-bit) pick value hold the PyGFX object id (per instance for instanced meshes)
+        pick = rows.view(np.uint16).reshape(height, width, 4)
+        ids = pick[..., 0].astype(np.uint32) | ((pick[..., 1].astype(np.uint32) & 0xF) << 16)
+        lut = instance_id_lut()
+        return np.where(ids < len(lut), lut[np.minimum(ids, len(lut) - 1)], 0).astype(np.uint32)
+    return rows.reshape(height, width, 4)
+
+
+class PendingFrame:
+    """Handle to frame(s) submitted to the GPU whose pixels have not been read back yet.
+    """
+    def __init__(self, buffer: wgpu.GPUBuffer, width: int, height: int, count: int = None, scratch: dict = None) -> None:
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+        self._count = count
+        self._scratch = scratch
+        self._frame = None
+
+    @property
+    def done(self) -> bool:
+        return self._frame is not None
+
+    def result(self, out: np.ndarray = None, pixel_format: str = None, dtype: np.dtype = None) -> np.ndarray:
+        """Reads back frame (blocking until the GPU has finished it) with shape (height, width, 4),
+        or (count, height, width, 4) for multiple frames. Frames are read back once; later calls return the same array.
+
+        Args:
+            out (np.ndarray, optional): Preallocated array to convert the frame into, straight from mapped memory.
+            pixel_format (str, optional): Channel layout; 'rgba' (default), 'bgra', 'rgb', 'bgr' or 'gray' (no channel axis).
+            dtype (np.dtype, optional):   np.uint8 (default) or np.float16 (in [0, 1]).
+
+        Returns:
+            np.ndarray: Frame (`out` if given).
+        """
+        if self._frame is None:
+            start = PROFILER.start()
+            count, height, width = self._count or 1, self._height, self._width
+            convert = out is not None or pixel_format is not None or dtype is not None
+            self._buffer.map_sync(wgpu.MapMode.READ)
+            try:
+                # Single copy out of mapped memory; frames are views that skip the row padding
+                data = np.frombuffer(self._buffer.read_mapped(copy=not convert), dtype=np.uint8)
+                size = count * height * _bytes_per_row(width)
+                frames = data[:size].reshape(count, height, -1)[:, :, :4 * width].reshape(count, height, width, 4)
+                if convert:
+                    frame = _convert_pixels(frames if self._count is not None else frames[0], pixel_format, out, dtype, self._scratch)
+                else:
+                    frame = frames if self._count is not None else np.ascontiguousarray(frames[0])
+
+                # Release views of mapped memory before unmapping
+                del data, frames
+            finally:
+                self._buffer.unmap()
+            self._frame = frame
+            PROFILER.stop('render.readback', start)
+        return self._frame
+
+
 class Renderer:
     """Renderer responsible for rendering game frames
     """
-    def __init__(self, width: int = 640, height: int = 480) -> None:
+    def __init__(self, width: int = 640, height: int = 480, pipeline_depth: int = 0) -> None:
+        """Initializes offscreen renderer.
+
+        Args:
+            width (int):          Width of frames in pixels.
+            height (int):         Height of frames in pixels.
+            pipeline_depth (int): Number of readback buffers (2-3) used to overlap GPU work and readback with 
+                                  the caller; frames are then returned `pipeline_depth - 1` calls late. 0 disables pipelining.
+        """
+        assert pipeline_depth == 0 or pipeline_depth >= 2, 'Pipeline depth must be 0 (disabled) or at least 2'
         self._canvas = WgpuCanvas(size=(width, height), pixel_ratio=1)
-        self._renderer = gfx.renderers.WgpuRenderer(self._canvas)
-        print("Renderer.__init__() :: Initialized")
+        # Internal targets at frame resolution (PyGFX supersamples 2x by default), so that frames read back
+        # from them have the same (height, width) as presented frames
+        self._renderer = gfx.renderers.WgpuRenderer(self._canvas, pixel_ratio=1)
 
-    def render(self, scene: Scene, camera: PerspectiveCamera, return_buffer: bool = False) -> np.ndarray:
+        # Ring of readback buffers for pipelined rendering (created on first use)
+        self._pipeline_depth = pipeline_depth
+        self._readback_buffers = []
+        self._readback_frames = [None] * pipeline_depth
+        self._readback_slot = 0
+        self._pending = deque()
+
+        # Tiled render target for rendering multiple cameras (created on first use)
+        self._atlas = None
+
+        # Readback buffers for rendering into preallocated frames and multiple outputs (created on first use)
+        self._frame_buffer = None
+        self._outputs_buffer = None
+        self._scratch = {}
+        LOGGER.info("Renderer.__init__() :: Initialized")
+
+    @property
+    def pipeline_depth(self) -> int:
+        return self._pipeline_depth
+
+    @property
+    def latency(self) -> int:
+        """Number of calls between submitting a frame with `render()` and it being returned.
+        """
+        return max(self._pipeline_depth - 1, 0)
+
+    def render(
+            self, 
+            scene: Scene, 
+            camera: PerspectiveCamera, 
+            return_buffer: bool = False, 
+            outputs: tuple[str] = None,
+            out: np.ndarray = None,
+            pixel_format: str = None,
+            dtype: np.dtype = None
+            ) -> Union[np.ndarray, dict[str, np.ndarray]]:
         """Renders scene using specified camera.
 
         Args:
             scene (Scene):                  Scene to be rendered.
             camera (PerspectiveCamera):     Camera used for rendering.
-            return_buffer (bool, optional): Whether to return the raw frame buffer with minimal antialiasing.
+            return_buffer (bool, optional): Whether to return the raw frame buffer with minimal antialiasing 
+                                            (always the case when pipelining).
+            outputs (tuple[str], optional): Buffers to return from a single (synchronous) draw; any of 'rgb' (raw frame buffer),
+                                            'depth' (normalized device depth in [0, 1]) and 'instance' (`Mesh.instance_id`, 
+                                            0 for background).
+            out (np.ndarray, optional):     Preallocated array the raw frame buffer is converted into during readback 
+                                            (no per-frame allocations); shape (height, width, channels) or (height, width).
+            pixel_format (str, optional):   Channel layout of the returned frame buffer; 'rgba' (default), 'bgra', 'rgb', 
+                                            'bgr' or 'gray'.
+            dtype (np.dtype, optional):     Type of the returned frame buffer; np.uint8 (default) or np.float16 (in [0, 1]).
 
         Returns:
-            np.ndarray: Rendered frame with shape (height, width, 4).
+            np.ndarray | dict: Rendered frame with shape (height, width, 4). When pipelining, the frame submitted 
+                        `latency` calls earlier is returned instead (None while the pipeline is filling up).
+                        If `outputs` is given, a dict with uint8 'rgb' (height, width, 4), float32 'depth' 
+                        (height, width) and/or uint32 'instance' (height, width) arrays instead.
         """
+        PROFILER.frame()
+        if outputs is not None:
+            return self._render_outputs(scene, camera, outputs)
+        if out is not None:
+            self._check_out(out)
+
+        if self._pipeline_depth:
+            self._pending.append(self.render_async(scene, camera))
+            if len(self._pending) < self._pipeline_depth:
+                return None
+            return self._pending.popleft().result(out, pixel_format, dtype)
+
+        # Read raw frame buffer back into the requested layout through a persistent readback buffer
+        if out is not None or pixel_format is not None or dtype is not None:
+            start = PROFILER.start()
+            texture = self._draw(scene, camera)
+            width, height = texture.size[:2]
+            size = _bytes_per_row(width) * height
+            if self._frame_buffer is None or self._frame_buffer.size != size:
+                self._frame_buffer = self._create_readback_buffer(size)
+            _copy_to_buffer(self._renderer.device, texture, self._frame_buffer, [(0, 0)], width, height)
+            PROFILER.stop('render.draw', start)
+            return PendingFrame(self._frame_buffer, width, height, scratch=self._scratch).result(out, pixel_format, dtype)
+
+        TRANSFORMS.flush()
+        scene.update_static()
+        scene.update_lod(camera)
+        start = PROFILER.start()
         self._canvas.request_draw(lambda: self._renderer.render(scene.get_instance(), camera.get_instance()))
         frame = self._canvas.draw()
+        PROFILER.stop('render.draw', start)
+        PROFILER.count('draw_calls', _num_draw_calls(scene))
 
         if return_buffer:
-            return self._renderer.snapshot()
+            start = PROFILER.start()
+            frame = self._renderer.snapshot()
+            PROFILER.stop('render.snapshot', start)
+            return frame
         else:
             return np.asarray(frame)
 
+    def _draw(self, scene: Scene, camera: PerspectiveCamera) -> wgpu.GPUTexture:
+        """Renders scene into the internal frame buffers (without presenting) and returns the color target.
+        """
+        TRANSFORMS.flush()
+        scene.update_static()
+        scene.update_lod(camera)
+        self._renderer.render(scene.get_instance(), camera.get_instance(), flush=True)
+        PROFILER.count('draw_calls', _num_draw_calls(scene))
+        return _render_target(self._renderer, 'color')
+
+    def _render_outputs(self, scene: Scene, camera: PerspectiveCamera, outputs: tuple[str]) -> dict[str, np.ndarray]:
+        for name in outputs:
+            if name not in RENDER_OUTPUTS:
+                raise Exception(f"output '{name}' not understood. Choose from {', '.join(map(repr, RENDER_OUTPUTS))}.")
+
+        # Render into internal frame buffers (color, depth and pick targets are written by the same passes)
+        start = PROFILER.start()
+        self._draw(scene, camera)
+
+        width, height = _render_target(self._renderer, 'color').size[:2]
+
+        # Copy all requested targets into one readback buffer with a single submission
+        offsets, size = {}, 0
+        for name in outputs:
+            offsets[name] = size
+            size += _bytes_per_row(width, RENDER_OUTPUTS[name][1]) * height
+
+        if self._outputs_buffer is None or self._outputs_buffer.size != size:
+            self._outputs_buffer = self._create_readback_buffer(size)
+        buffer = self._outputs_buffer
+
+        encoder = self._renderer.device.create_command_encoder()
+        for name in outputs:
+            target, bytes_per_pixel, aspect = RENDER_OUTPUTS[name]
+            _encode_copy(encoder, _render_target(self._renderer, target), buffer, [(0, 0)], width, height, bytes_per_pixel, offsets[name], aspect)
+        self._renderer.device.queue.submit([encoder.finish()])
+        PROFILER.stop('render.draw', start)
+
+        start = PROFILER.start()
+        buffer.map_sync(wgpu.MapMode.READ)
+        try:
+            data = np.frombuffer(buffer.read_mapped(copy=True), dtype=np.uint8)
+        finally:
+            buffer.unmap()
+
+        results = {}
+        for name in outputs:
+            bytes_per_pixel = RENDER_OUTPUTS[name][1]
+            bytes_per_row = _bytes_per_row(width, bytes_per_pixel)
+            rows = data[offsets[name]:offsets[name] + bytes_per_row * height].reshape(height, bytes_per_row)
+            results[name] = _decode_output(name, np.ascontiguousarray(rows[:, :bytes_per_pixel * width]), width, height)
+        PROFILER.stop('render.readback', start)
+        return results
+
+    def render_async(self, scene: Scene, camera: PerspectiveCamera) -> PendingFrame:
+        """Submits a frame to the GPU and returns immediately. The raw frame buffer is copied to a 
+        readback buffer on the GPU, which is only mapped to the CPU once the result is requested.
 
-    
\ No newline at end of file
+        Args:
+            scene (Scene):              Scene to be rendered.
+            camera (PerspectiveCamera): Camera used for rendering.
+
+        Returns:
+            PendingFrame: Handle resolving to the frame buffer with shape (height, width, 4).
+        """
+        assert self._pipeline_depth, 'Asynchronous rendering requires a Renderer with pipeline_depth >= 2'
+
+        # Wait until the readback buffer of this slot is free again
+        slot = self._readback_slot
+        self._readback_slot = (slot + 1) % self._pipeline_depth
+        if self._readback_frames[slot] is not None:
+            self._readback_frames[slot].result()
+
+        # Render into internal frame buffer
+        start = PROFILER.start()
+        texture = self._draw(scene, camera)
+        width, height = texture.size[:2]
+        size = _bytes_per_row(width) * height
+
+        if not self._readback_buffers or self._readback_buffers[0].size != size:
+            self._readback_buffers = [self._create_readback_buffer(size) for _ in range(self._pipeline_depth)]
+
+        # Enqueue GPU->GPU copy directly behind this frame's render passes
+        buffer = self._readback_buffers[slot]
+        _copy_to_buffer(self._renderer.device, texture, buffer, [(0, 0)], width, height)
+
+        PROFILER.stop('render.draw', start)
+
+        frame = PendingFrame(buffer, width, height, scratch=self._scratch)
+        self._readback_frames[slot] = frame
+        return frame
+
+    def render_many(
+            self, 
+            scene: Scene, 
+            cameras: list[PerspectiveCamera], 
+            out: np.ndarray = None, 
+            pixel_format: str = None, 
+            dtype: np.dtype = None
+            ) -> np.ndarray:
+        """Renders scene from multiple cameras into the viewports of a single tiled frame buffer 
+        (atlas), which is read back to the CPU at once.
+
+        Args:
+            scene (Scene):                     Scene to be rendered.
+            cameras (list[PerspectiveCamera]): Cameras used for rendering.
+            out (np.ndarray, optional):        Preallocated array of shape (num_cameras, height, width, channels) to read into.
+            pixel_format (str, optional):      Channel layout (see `render`).
+            dtype (np.dtype, optional):        Type of frames (see `render`).
+
+        Returns:
+            np.ndarray: Raw frame buffers (like `return_buffer=True`) with shape (num_cameras, height, width, 4); 
+                        the frames are views into one shared array.
+        """
+        num_cameras = len(cameras)
+        assert num_cameras > 0, 'At least one camera is required'
+        if out is not None:
+            self._check_out(out, num_cameras)
+        cols = int(np.ceil(np.sqrt(num_cameras)))
+        rows = int(np.ceil(num_cameras / cols))
+        width, height = self._canvas.get_logical_size()
+
+        # (Re)create atlas render target when the layout changes
+        if self._atlas is None or self._atlas[0] != (rows, cols):
+            canvas = WgpuCanvas(size=(cols * width, rows * height), pixel_ratio=1)
+            self._atlas = ((rows, cols), canvas, gfx.renderers.WgpuRenderer(canvas, pixel_ratio=1), None)
+        layout, canvas, renderer, buffer = self._atlas
+
+        TRANSFORMS.flush()
+        scene.update_static()
+        start = PROFILER.start()
+        for i, camera in enumerate(cameras):
+            row, col = divmod(i, cols)
+            scene.update_lod(camera)
+
+            # Targets are cleared by the first render after a flush; the last render flushes all tiles
+            renderer.render(
+                scene.get_instance(), 
+                camera.get_instance(), 
+                rect=(col * width, row * height, width, height), 
+                flush=(i == num_cameras - 1)
+                )
+
+        # Copy all tiles back-to-back so that each camera's frame is contiguous in the readback
+        texture = _render_target(renderer, 'color')
+        tile_width, tile_height = texture.size[0] // cols, texture.size[1] // rows
+        size = num_cameras * _bytes_per_row(tile_width) * tile_height
+        if buffer is None or buffer.size < size:
+            buffer = self._create_readback_buffer(size)
+            self._atlas = (layout, canvas, renderer, buffer)
+
+        origins = [(col * tile_width, row * tile_height) for row, col in map(lambda i: divmod(i, cols), range(num_cameras))]
+        _copy_to_buffer(renderer.device, texture, buffer, origins, tile_width, tile_height)
+        PROFILER.stop('render.draw', start)
+        PROFILER.count('draw_calls', num_cameras * _num_draw_calls(scene))
+        return PendingFrame(buffer, tile_width, tile_height, count=num_cameras, scratch=self._scratch).result(out, pixel_format, dtype)
+
+    def _check_out(self, out: np.ndarray, count: int = None) -> None:
+        width, height = map(int, self._canvas.get_logical_size())
+        shape = (height, width) if count is None else (count, height, width)
+        assert out.shape[:len(shape)] == shape, f'Output buffer must have shape {shape} (+ channels), got {out.shape}'
+
+    def _create_readback_buffer(self, size: int) -> wgpu.GPUBuffer:
+        return self._renderer.device.create_buffer(size=size, usage=wgpu.BufferUsage.COPY_DST | wgpu.BufferUsage.MAP_READ)
+
+    def flush(self) -> list[np.ndarray]:
+        """Returns all frames still in flight (oldest first), e.g. at the end of a run.
+        """
+        frames = [frame.result() for frame in self._pending]
+        self._pending.clear()
+        return frames
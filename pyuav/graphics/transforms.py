@@ -0,0 +1,133 @@
+import numpy as np
+from typing import Union
+from pyuav.graphics.datatypes import GfxObject
+from pyuav.profiling import PROFILER
+
+Handles = Union[int, np.ndarray]
+
+
+def quat_from_y_angles(angles: np.ndarray) -> np.ndarray:
+    """Converts angles (in radians) about the Y-axis of shape (N,) to (x, y, z, w) quaternions of shape (N, 4).
+    """
+    angles = np.asarray(angles, dtype=np.float32)
+    quats = np.zeros(angles.shape + (4,), dtype=np.float32)
+    quats[..., 1] = np.sin(angles / 2)
+    quats[..., 3] = np.cos(angles / 2)
+    return quats
+
+
+class TransformStore:
+    """Struct-of-arrays store of the local poses of scene-graph objects. Poses are written to contiguous
+    arrays and only copied to the PyGFX objects whose pose changed when the store is flushed (once per frame).
+
+    Objects in the store must only be posed through it: a pose set directly on the object (e.g. `Mesh.set_position`)
+    is overwritten by the next flush of its slot, and reading the object's pose (e.g. `Mesh.get_position`) returns
+    its pose as of the last flush. The store holds a reference to each object until it is removed.
+    """
+    def __init__(self, capacity: int = 64) -> None:
+        """Initializes store.
+
+        Args:
+            capacity (int): Initial number of objects (grows as objects are added).
+        """
+        self._positions = np.zeros((capacity, 3), dtype=np.float32)
+        self._rotations = np.zeros((capacity, 4), dtype=np.float32)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        self._objects = []
+        self._free = []
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:len(self._objects)]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        return self._rotations[:len(self._objects)]
+
+    @property
+    def num_dirty(self) -> int:
+        return int(np.count_nonzero(self._dirty))
+
+    def add(self, obj: GfxObject) -> int:
+        """Adds an object to the store, initialized with its current local pose.
+
+        Returns:
+            int: Handle of the object's pose in the store.
+        """
+        instance = obj.get_instance()
+        if self._free:
+            # Reuse slot of a removed object
+            handle = self._free.pop()
+            self._objects[handle] = instance
+        else:
+            handle = len(self._objects)
+            if handle == len(self._dirty):
+                self._positions = np.concatenate([self._positions, np.zeros_like(self._positions)])
+                self._rotations = np.concatenate([self._rotations, np.zeros_like(self._rotations)])
+                self._dirty = np.concatenate([self._dirty, np.zeros_like(self._dirty)])
+            self._objects.append(instance)
+
+        self._positions[handle] = instance.local.position
+        self._rotations[handle] = instance.local.rotation
+        return handle
+
+    def remove(self, handles: Handles) -> None:
+        """Removes objects from the store; their handles are reused by objects added later.
+        """
+        for handle in np.atleast_1d(handles):
+            if self._objects[handle] is None:
+                continue
+            self._objects[handle] = None
+            self._dirty[handle] = False
+            self._free.append(int(handle))
+
+    def set_positions(self, handles: Handles, positions: np.ndarray) -> None:
+        self._positions[handles] = positions
+        self._dirty[handles] = True
+
+    def set_rotations(self, handles: Handles, rotations: np.ndarray) -> None:
+        self._rotations[handles] = rotations
+        self._dirty[handles] = True
+
+    def set_poses(self, handles: Handles, positions: np.ndarray, rotations: np.ndarray) -> None:
+        self._positions[handles] = positions
+        self._rotations[handles] = rotations
+        self._dirty[handles] = True
+
+    def get_positions(self, handles: Handles) -> np.ndarray:
+        return self._positions[handles].copy()
+
+    def get_rotations(self, handles: Handles) -> np.ndarray:
+        return self._rotations[handles].copy()
+
+    def flush(self) -> int:
+        """Writes the poses changed since the last flush to their PyGFX objects.
+
+        Returns:
+            int: Number of objects updated.
+        """
+        dirty = np.flatnonzero(self._dirty)
+        if not len(dirty):
+            return 0
+
+        start = PROFILER.start()
+        for i in dirty:
+            local = self._objects[i].local
+            local.position = self._positions[i]
+            local.rotation = self._rotations[i]
+        self._dirty[dirty] = False
+        PROFILER.stop('transforms.flush', start)
+        PROFILER.count('transforms.flushed', len(dirty))
+        return len(dirty)
+
+    def clear(self) -> None:
+        self._objects.clear()
+        self._free.clear()
+        self._dirty[:] = False
+
+    def __len__(self) -> int:
+        return len(self._objects) - len(self._free)
+
+
+# Store shared by all entities in this process (flushed by `Renderer` before rendering)
+TRANSFORMS = TransformStore()
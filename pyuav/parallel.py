@@ -0,0 +1,382 @@
+import os
+import json
+import numpy as np
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+from pyuav.profiling import LOGGER
+
+
+class SharedArrays:
+    def __init__(self, specs: dict[str, tuple[tuple, np.dtype]], name: str = None) -> None:
+        """Set of NumPy arrays laid out back-to-back in a single shared-memory block.
+
+        Args:
+            specs (dict):          Shape and dtype of each array by name.
+            name (str, optional):  Name of an existing block to attach to (creates a new block otherwise).
+        """
+        self._specs = specs
+
+        offsets, size = {}, 0
+        for key, (shape, dtype) in specs.items():
+            size = (size + 63) // 64 * 64 # align arrays to cache lines
+            offsets[key] = size
+            size += int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        self._owner = name is None
+        self._shm = SharedMemory(create=True, size=max(size, 1)) if self._owner else SharedMemory(name=name)
+        self._arrays = {
+            key: np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offsets[key])
+            for key, (shape, dtype) in specs.items()
+        }
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def specs(self) -> dict:
+        return self._specs
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._arrays[key]
+
+    def close(self) -> None:
+        self._arrays.clear()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SwarmWorld:
+    def __init__(
+            self, 
+            positions: np.ndarray,
+            mode: str = 'primitive',
+            width: int = None,
+            height: int = None,
+            camera_position: tuple[float, float, float] = (25, 15, 25),
+            backend: str = 'pygfx'
+            ) -> None:
+        """Minimal environment for `ParallelRunner` consisting of a `Swarm` and (optionally) a renderer.
+
+        Args:
+            positions (np.ndarray):   Initial positions of drones of shape (num_drones, 3).
+            mode (str):               Physics backend; 'pyflyt' or 'primitive' (default).
+            width (int, optional):    Width of rendered frames (no rendering if None).
+            height (int, optional):   Height of rendered frames (no rendering if None).
+            camera_position (tuple):  Position of camera looking at the origin.
+            backend (str):            Renderer backend registered in `pyuav.backends.RENDERERS`; 'pygfx' (default).
+        """
+        from pyuav.entities import Swarm
+        from pyuav.graphics.lighting import AmbientLight, DirectionalLight
+        from pyuav.backends import RENDERERS
+        from pyuav.graphics.rendering import Scene, Grid, PerspectiveCamera
+
+        self._swarm = Swarm(positions=positions, mode=mode)
+        self._renderer = None
+        if width is not None and height is not None:
+            self._scene = Scene(Grid(), AmbientLight(), DirectionalLight(), self._swarm)
+            self._camera = PerspectiveCamera(position=camera_position)
+            self._camera.set_lookat((0, 0, 0))
+            self._renderer = RENDERERS.create(backend, width=width, height=height)
+
+    def step(self, targets: np.ndarray, headings: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._swarm.control(targets, headings)
+        positions, rotations = self._swarm.get_pose()
+
+        frame = None
+        if self._renderer is not None:
+            frame = self._renderer.render(self._scene, self._camera)
+        return positions, rotations, frame
+
+
+def _worker(rank: int, env_fn: Callable, shm_name: str, specs: dict, conn: Connection) -> None:
+    shared = None
+    try:
+        shared = SharedArrays(specs, name=shm_name)
+        env = env_fn(rank)
+        while True:
+            command = conn.recv()
+            if command == 'step':
+                positions, rotations, frame = env.step(shared['targets'][rank], shared['headings'][rank])
+                shared['positions'][rank] = positions
+                shared['rotations'][rank] = rotations
+                if frame is not None and 'frames' in specs:
+                    shared['frames'][rank] = frame
+                conn.send(True)
+            elif command == 'close':
+                break
+    finally:
+        if shared is not None:
+            shared.close()
+        conn.close()
+
+
+class ParallelRunner:
+    def __init__(
+            self,
+            env_fn: Callable[[int], object],
+            num_workers: int,
+            num_drones: int,
+            frame_shape: tuple[int, int, int] = None,
+            timeout: float = None
+            ) -> None:
+        """Runs `num_workers` environments in separate processes, each owning its own scene, physics client and renderer.
+        Targets are sent to and states and frames are received from the workers through one preallocated
+        shared-memory block instead of pickling arrays.
+
+        Args:
+            env_fn (Callable):           Picklable (module-level) function creating the environment of worker `rank`.
+                                         Environments implement `step(targets, headings) -> (positions, rotations, frame)`.
+            num_workers (int):           Number of worker processes.
+            num_drones (int):            Number of drones per environment.
+            frame_shape (tuple, optional): Shape (height, width, channels) of frames returned by each environment;
+                                           None for state-only environments.
+            timeout (float, optional):   Maximum number of seconds to wait for a worker to finish a step
+                                         (default: wait as long as the worker is alive).
+        """
+        specs = dict(
+            targets=((num_workers, num_drones, 3), np.float32),
+            headings=((num_workers, num_drones), np.float32),
+            positions=((num_workers, num_drones, 3), np.float32),
+            rotations=((num_workers, num_drones, 4), np.float32),
+            )
+        if frame_shape is not None:
+            specs['frames'] = ((num_workers, *frame_shape), np.uint8)
+
+        self._num_workers = num_workers
+        self._timeout = timeout
+        self._shared = SharedArrays(specs)
+
+        # Spawn (rather than fork) so that each worker initializes its own GPU device
+        ctx = mp.get_context('spawn')
+        self._conns, self._processes = [], []
+        for rank in range(num_workers):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(rank, env_fn, self._shared.name, specs, child_conn), daemon=True)
+            process.start()
+
+            # Close the parent's copy of the worker's end, so that the pipe reports EOF once the worker exits
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        LOGGER.info(f'ParallelRunner.__init__() :: Started {num_workers} workers')
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    def step(self, targets: np.ndarray, headings: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Steps all environments in parallel.
+
+        Args:
+            targets (np.ndarray):  Targets of shape (num_workers, num_drones, 3).
+            headings (np.ndarray): Headings of shape (num_workers, num_drones).
+
+        Returns:
+            tuple: Positions (num_workers, num_drones, 3), rotations (num_workers, num_drones, 4) and frames
+                   (num_workers, height, width, channels) or None. These are views into shared memory that are
+                   overwritten by the next call.
+        """
+        self._shared['targets'][:] = targets
+        self._shared['headings'][:] = headings
+
+        for rank, conn in enumerate(self._conns):
+            try:
+                conn.send('step')
+            except OSError:
+                raise RuntimeError(self._failure(rank))
+        for rank in range(self._num_workers):
+            self._receive(rank)
+
+        frames = self._shared['frames'] if 'frames' in self._shared.specs else None
+        return self._shared['positions'], self._shared['rotations'], frames
+
+    def _failure(self, rank: int) -> str:
+        return f'ParallelRunner worker {rank} failed (exit code {self._processes[rank].exitcode})'
+
+    def _receive(self, rank: int) -> object:
+        """Waits for a reply of worker `rank`, raising a `RuntimeError` if the worker died or timed out.
+        """
+        conn, process = self._conns[rank], self._processes[rank]
+        waited = 0.0
+        while not conn.poll(0.1):
+            waited += 0.1
+            if not process.is_alive():
+                raise RuntimeError(self._failure(rank))
+            if self._timeout is not None and waited >= self._timeout:
+                raise RuntimeError(f'ParallelRunner worker {rank} did not respond within {self._timeout} seconds')
+        try:
+            return conn.recv()
+        except (EOFError, OSError):
+            process.join(timeout=1)
+            raise RuntimeError(self._failure(rank))
+
+    def close(self) -> None:
+        for conn, process in zip(self._conns, self._processes):
+            if process.is_alive():
+                try:
+                    conn.send('close')
+                except OSError:
+                    pass
+            process.join(timeout=5)
+            conn.close()
+        self._shared.close()
+
+    def __enter__(self) -> 'ParallelRunner':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# Per-process state of render farm workers (see `render_trajectory`)
+_RENDER_WORKER = None
+
+# Number of channels of rendered frames by pixel format (see `Renderer.render`)
+_PIXEL_CHANNELS = dict(rgba=4, bgra=4, rgb=3, bgr=3, gray=None)
+
+
+def _init_render_worker(
+        scene_fn: Callable, file_path: str, cameras: list, output_dir: str, width: int, height: int, pixel_format: str, backend: str
+        ) -> None:
+    global _RENDER_WORKER
+    from pyuav.backends import RENDERERS
+    from pyuav.graphics.rendering import PerspectiveCamera
+    from pyuav.trajectory import Replay
+
+    # Scene, renderer and cameras are built once per worker and reused for all chunks it renders
+    scene, entities = scene_fn()
+    views = []
+    for position, lookat in cameras:
+        camera = PerspectiveCamera(position=position)
+        camera.set_lookat(lookat)
+        views.append(camera)
+
+    _RENDER_WORKER = dict(
+        scene=scene,
+        replay=Replay(file_path, entities),
+        cameras=views,
+        renderer=RENDERERS.create(backend, width=width, height=height),
+        frames=np.load(os.path.join(output_dir, 'frames.npy'), mmap_mode='r+'),
+        steps=np.load(os.path.join(output_dir, 'steps.npy')),
+        pixel_format=pixel_format
+        )
+
+
+def _render_chunk(chunk: tuple[int, int, int]) -> int:
+    index, start, stop = chunk
+    worker = _RENDER_WORKER
+    frames, cameras = worker['frames'], worker['cameras']
+    for i in range(start, stop):
+        worker['replay'].apply(worker['steps'][i])
+        if len(cameras) == 1:
+            worker['renderer'].render(worker['scene'], cameras[0], out=frames[i, 0], pixel_format=worker['pixel_format'])
+        else:
+            worker['renderer'].render_many(worker['scene'], cameras, out=frames[i], pixel_format=worker['pixel_format'])
+
+    # Frames are on disk before the chunk is reported (and recorded) as done
+    frames.flush()
+    return index
+
+
+def render_trajectory(
+        file_path: str,
+        scene_fn: Callable[[], tuple[object, list]],
+        cameras: list[tuple[tuple, tuple]],
+        output_dir: str,
+        width: int = 640,
+        height: int = 480,
+        render_hz: float = None,
+        pixel_format: str = 'rgb',
+        num_workers: int = None,
+        chunk_size: int = 64,
+        backend: str = 'pygfx'
+        ) -> np.ndarray:
+    """Renders a trajectory log (see `TrajectoryWriter`) offline from a fixed set of cameras, sharding the frames 
+    across a pool of worker processes that each own their own scene and renderer. Frames are written in order to a 
+    memory-mapped array `frames.npy` in `output_dir`; chunks that were already rendered by an interrupted run with the 
+    same settings are skipped, so calling this again resumes rendering.
+
+    Args:
+        file_path (str):            Path of trajectory log.
+        scene_fn (Callable):        Picklable (module-level) function building `(scene, entities)` in each worker, where 
+                                    `entities` are posed from the log in the order they were logged (see `Replay`).
+        cameras (list):             Cameras as `(position, lookat)` pairs in world coordinates.
+        output_dir (str):           Directory to write frames, rendered steps and progress to.
+        width (int):                Width of frames in pixels.
+        height (int):               Height of frames in pixels.
+        render_hz (float, optional): Frame rate to render at (default: every logged step).
+        pixel_format (str):         Channel layout of frames; 'rgb' (default), 'rgba', 'bgr', 'bgra' or 'gray'.
+        num_workers (int, optional): Number of worker processes (default: number of CPU cores).
+        chunk_size (int):           Number of consecutive frames rendered per task.
+        backend (str):              Renderer backend registered in `pyuav.backends.RENDERERS`; 'pygfx' (default).
+
+    Returns:
+        np.ndarray: Memory-mapped frames of shape (num_frames, num_cameras, height, width[, channels]).
+    """
+    from pyuav.trajectory import load_trajectory, frame_steps
+
+    if pixel_format not in _PIXEL_CHANNELS:
+        raise Exception(f"pixel format '{pixel_format}' not understood. Choose from {', '.join(map(repr, _PIXEL_CHANNELS))}.")
+    assert len(cameras) > 0, 'At least one camera is required'
+    cameras = [(tuple(map(float, position)), tuple(map(float, lookat))) for position, lookat in cameras]
+
+    _, records = load_trajectory(file_path)
+    steps = frame_steps(records['time'], render_hz)
+    num_frames = len(steps)
+    del records
+
+    # Settings a previous run must match to be resumed
+    channels = _PIXEL_CHANNELS[pixel_format]
+    shape = (num_frames, len(cameras), height, width) + (() if channels is None else (channels,))
+    settings = dict(
+        trajectory=os.path.abspath(file_path),
+        trajectory_size=os.path.getsize(file_path),
+        cameras=cameras,
+        shape=list(shape),
+        pixel_format=pixel_format,
+        render_hz=render_hz,
+        chunk_size=chunk_size
+        )
+
+    meta_file = os.path.join(output_dir, 'meta.json')
+    done = set()
+    if os.path.isfile(meta_file):
+        with open(meta_file, 'r') as f:
+            meta = json.load(f)
+        if meta['settings'] != json.loads(json.dumps(settings)):
+            raise Exception(f"'{output_dir}' contains frames rendered with different settings")
+        done = set(meta['done'])
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+        np.save(os.path.join(output_dir, 'steps.npy'), steps)
+        np.lib.format.open_memmap(os.path.join(output_dir, 'frames.npy'), mode='w+', dtype=np.uint8, shape=shape).flush()
+
+    def save_progress() -> None:
+        # Replace atomically so that an interrupted run never leaves a corrupt progress file
+        with open(meta_file + '.tmp', 'w') as f:
+            json.dump(dict(settings=settings, done=sorted(done)), f)
+        os.replace(meta_file + '.tmp', meta_file)
+
+    save_progress()
+    chunks = [
+        (index, start, min(start + chunk_size, num_frames))
+        for index, start in enumerate(range(0, num_frames, chunk_size))
+        if index not in done
+        ]
+    LOGGER.info(f'render_trajectory() :: {num_frames} frames, {len(chunks)} of {-(-num_frames // chunk_size)} chunks to render')
+
+    if chunks:
+        # Spawn (rather than fork) so that each worker initializes its own GPU device
+        num_workers = min(num_workers or os.cpu_count() or 1, len(chunks))
+        initargs = (scene_fn, file_path, cameras, output_dir, width, height, pixel_format, backend)
+        with mp.get_context('spawn').Pool(num_workers, initializer=_init_render_worker, initargs=initargs) as pool:
+            for index in pool.imap_unordered(_render_chunk, chunks):
+                done.add(index)
+                save_progress()
+                LOGGER.info(f'render_trajectory() :: rendered chunk {index} ({len(done)}/{-(-num_frames // chunk_size)} chunks)')
+
+    return np.load(os.path.join(output_dir, 'frames.npy'), mmap_mode='r')
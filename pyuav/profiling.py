@@ -0,0 +1,123 @@
+import time
+import logging
+import numpy as np
+from contextlib import nullcontext
+from pyuav.graphics.assets import ASSET_CACHE
+
+# Logger shared by all pyuav modules (silent unless configured, e.g. with `logging.basicConfig(level=logging.INFO)`)
+LOGGER = logging.getLogger('pyuav')
+
+
+class _RingBuffer:
+    def __init__(self, capacity: int) -> None:
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        self._values[self._count % len(self._values)] = value
+        self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:min(self._count, len(self._values))]
+
+
+class _Timer:
+    def __init__(self, profiler: 'Profiler', stage: str) -> None:
+        self._profiler = profiler
+        self._stage = stage
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        self._profiler.record(self._stage, time.perf_counter() - self._start)
+
+
+class Profiler:
+    def __init__(self, capacity: int = 1024) -> None:
+        """Opt-in per-stage timing and counters. Timings of each stage are kept in a ring buffer holding
+        the last `capacity` samples. While disabled, all methods return immediately.
+
+        Args:
+            capacity (int): Number of samples kept per stage.
+        """
+        self.enabled = False
+        self._capacity = capacity
+        self._timings = {}
+        self._counters = {}
+        self._last_frame = None
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        self._timings.clear()
+        self._counters.clear()
+        self._last_frame = None
+
+    def start(self) -> float:
+        """Returns start time of a stage (to be passed to `stop()`).
+        """
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, stage: str, start: float) -> None:
+        if self.enabled:
+            self.record(stage, time.perf_counter() - start)
+
+    def stage(self, name: str):
+        """Context manager timing the enclosed block as stage `name`.
+        """
+        return _Timer(self, name) if self.enabled else nullcontext()
+
+    def record(self, stage: str, seconds: float) -> None:
+        if stage not in self._timings:
+            self._timings[stage] = _RingBuffer(self._capacity)
+        self._timings[stage].append(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def frame(self) -> None:
+        """Marks the end of a frame; intervals between frames are recorded as stage 'frame'.
+        """
+        if self.enabled:
+            now = time.perf_counter()
+            if self._last_frame is not None:
+                self.record('frame', now - self._last_frame)
+            self._last_frame = now
+
+    def report(self) -> dict:
+        """Summarizes timings (in milliseconds) and counters.
+
+        Returns:
+            dict: Per-stage count, mean, p50, p95 and p99, frames/s and counters (including asset cache statistics).
+        """
+        stages = {}
+        for stage, buffer in self._timings.items():
+            values = 1000 * buffer.values
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            stages[stage] = dict(count=buffer.count, mean=float(values.mean()), p50=float(p50), p95=float(p95), p99=float(p99))
+
+        fps = 1000 / stages['frame']['mean'] if 'frame' in stages else None
+        counters = dict(self._counters)
+        counters.update({f'asset_cache.{k}': v for k, v in ASSET_CACHE.stats.items()})
+        return dict(stages=stages, fps=fps, counters=counters)
+
+    def log_report(self) -> None:
+        report = self.report()
+        for stage, stats in sorted(report['stages'].items()):
+            LOGGER.info(f"{stage:<24} n={stats['count']:<8} p50={stats['p50']:.3f}ms p95={stats['p95']:.3f}ms p99={stats['p99']:.3f}ms")
+        if report['fps'] is not None:
+            LOGGER.info(f"frames/s: {report['fps']:.1f}")
+        for name, value in sorted(report['counters'].items()):
+            LOGGER.info(f'{name}: {value}')
+
+
+# Profiler shared by all pyuav modules (enable with `PROFILER.enable()`)
+PROFILER = Profiler()
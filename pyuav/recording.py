@@ -0,0 +1,186 @@
+import os
+import json
+import queue
+import threading
+import numpy as np
+from pyuav.profiling import LOGGER
+
+
+class Recorder:
+    def __init__(
+            self,
+            video_path: str = None,
+            dataset_dir: str = None,
+            fps: int = 30,
+            max_queue: int = 64,
+            policy: str = 'drop',
+            chunk_size: int = 256
+            ) -> None:
+        """Records frames and per-step drone states on a background thread, so that encoding and disk I/O
+        never run inside the simulation loop.
+
+        Args:
+            video_path (str, optional):  Path of MP4 video to write (requires the `imageio-ffmpeg` package).
+            dataset_dir (str, optional): Directory to write chunked memory-mapped .npy dataset to.
+            fps (int):                   Frame rate of video.
+            max_queue (int):             Maximum number of steps waiting to be written.
+            policy (str):                What to do when the queue is full; 'drop' the new step (default) or 'block' until there is room.
+            chunk_size (int):            Number of steps per dataset chunk.
+        """
+        assert video_path is not None or dataset_dir is not None, 'Specify a video path and/or dataset directory'
+        if policy not in ('drop', 'block'):
+            raise Exception(f"policy '{policy}' not understood. Choose from 'drop' (default) or 'block'.")
+
+        self._video_path = video_path
+        self._dataset_dir = dataset_dir
+        self._fps = fps
+        self._policy = policy
+        self._chunk_size = chunk_size
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._num_recorded = 0
+        self._num_dropped = 0
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        LOGGER.info('Recorder.__init__() :: Initialized')
+
+    @property
+    def num_recorded(self) -> int:
+        return self._num_recorded
+
+    @property
+    def num_dropped(self) -> int:
+        return self._num_dropped
+
+    def record(
+            self,
+            frame: np.ndarray = None,
+            positions: np.ndarray = None,
+            rotations: np.ndarray = None,
+            targets: np.ndarray = None
+            ) -> bool:
+        """Queues a step for writing. Arrays are copied, so callers may reuse their buffers.
+
+        Args:
+            frame (np.ndarray, optional):     Rendered frame of shape (height, width, channels).
+            positions (np.ndarray, optional): Drone positions of shape (num_drones, 3).
+            rotations (np.ndarray, optional): Drone rotations of shape (num_drones, 4).
+            targets (np.ndarray, optional):   Drone targets of shape (num_drones, 3).
+
+        Returns:
+            bool: Whether the step was queued (False if it was dropped).
+        """
+        if self._error is not None:
+            raise RuntimeError('Recorder stopped due to an error') from self._error
+
+        step = {
+            key: np.array(value)
+            for key, value in dict(frame=frame, positions=positions, rotations=rotations, targets=targets).items()
+            if value is not None
+            }
+
+        try:
+            self._queue.put(step, block=self._policy == 'block')
+        except queue.Full:
+            self._num_dropped += 1
+            return False
+        return True
+
+    def close(self) -> None:
+        """Writes all queued steps and finalizes the outputs. Raises a `RuntimeError` if writing failed.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise RuntimeError('Recorder stopped due to an error') from self._error
+        LOGGER.info(f'Recorder.close() :: recorded {self._num_recorded} steps ({self._num_dropped} dropped)')
+
+    def __enter__(self) -> 'Recorder':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        video, chunk, chunk_index, chunk_fill = None, None, 0, 0
+        meta = dict(chunk_size=self._chunk_size, chunks=[], num_steps=0)
+        try:
+            while True:
+                step = self._queue.get()
+                if step is None:
+                    break
+
+                # Encode video frame (dropping alpha channel)
+                if self._video_path is not None and 'frame' in step:
+                    if video is None:
+                        import imageio.v2 as imageio
+                        video = imageio.get_writer(self._video_path, fps=self._fps, macro_block_size=1)
+                    video.append_data(step['frame'][..., :3])
+
+                # Append step to current dataset chunk
+                if self._dataset_dir is not None:
+                    if chunk is None:
+                        chunk = self._open_chunk(chunk_index, step)
+                        meta['chunks'].append(dict(index=chunk_index, length=0))
+                    for key, value in step.items():
+                        chunk[key][chunk_fill] = value
+                    chunk_fill += 1
+                    meta['chunks'][-1]['length'] = chunk_fill
+                    meta['num_steps'] += 1
+
+                    if chunk_fill == self._chunk_size:
+                        self._close_chunk(chunk, meta)
+                        chunk, chunk_index, chunk_fill = None, chunk_index + 1, 0
+
+                self._num_recorded += 1
+        except Exception as e:
+            self._error = e
+
+            # Unblock producers waiting for room in the queue
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        finally:
+            if video is not None:
+                video.close()
+            if chunk is not None:
+                self._close_chunk(chunk, meta)
+
+    def _open_chunk(self, index: int, step: dict) -> dict:
+        os.makedirs(self._dataset_dir, exist_ok=True)
+        return {
+            key: np.lib.format.open_memmap(
+                os.path.join(self._dataset_dir, f'{key}_{index:05d}.npy'),
+                mode='w+',
+                dtype=value.dtype,
+                shape=(self._chunk_size, *value.shape)
+                )
+            for key, value in step.items()
+        }
+
+    def _close_chunk(self, chunk: dict, meta: dict) -> None:
+        for array in chunk.values():
+            array.flush()
+        with open(os.path.join(self._dataset_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+
+def load_dataset(dataset_dir: str, key: str) -> list[np.ndarray]:
+    """Loads a recorded dataset array as a list of memory-mapped chunks (trimmed to their recorded length).
+
+    Args:
+        dataset_dir (str): Directory the dataset was written to.
+        key (str):         Array to load; 'frame', 'positions', 'rotations' or 'targets'.
+
+    Returns:
+        list[np.ndarray]: Chunks of shape (chunk_length, ...).
+    """
+    with open(os.path.join(dataset_dir, 'meta.json'), 'r') as f:
+        meta = json.load(f)
+
+    return [
+        np.load(os.path.join(dataset_dir, f"{key}_{chunk['index']:05d}.npy"), mmap_mode='r')[:chunk['length']]
+        for chunk in meta['chunks']
+    ]
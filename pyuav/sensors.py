@@ -0,0 +1,94 @@
+import numpy as np
+from pyuav.collision import CollisionWorld
+from pyuav.profiling import PROFILER
+
+
+def rotate_vectors(rotations: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """Rotates vectors of shape (M, 3) by each of the (x, y, z, w) quaternions of shape (N, 4).
+
+    Returns:
+        np.ndarray: Rotated vectors of shape (N, M, 3).
+    """
+    rotations = np.asarray(rotations, dtype=np.float32).reshape(-1, 1, 4)
+    q, w = rotations[..., :3], rotations[..., 3:]
+    uv = np.cross(q, vectors[np.newaxis])
+    return vectors + 2 * (w * uv + np.cross(q, uv))
+
+
+class Lidar:
+    def __init__(
+            self,
+            world: CollisionWorld,
+            horizontal_beams: int = 360,
+            vertical_beams: int = 16,
+            vertical_fov: float = 30.0,
+            max_range: float = 50.0,
+            offset: tuple[float, float, float] = (0, 0, 0)
+            ) -> None:
+        """Body-mounted scanning range sensor (lidar) casting rays against the static meshes of a `CollisionWorld`,
+        for all drones at once and without rendering. Beams are spread uniformly over 360 degrees around the drone's
+        up (+Y) axis, starting at its forward (+X) axis, and over `vertical_fov` degrees of elevation.
+
+        Use `horizontal_beams=1, vertical_beams=1, vertical_fov=0` for a single forward-facing rangefinder.
+
+        Args:
+            world (CollisionWorld):  World whose static meshes are scanned.
+            horizontal_beams (int):  Number of beams per revolution.
+            vertical_beams (int):    Number of beams in elevation.
+            vertical_fov (float):    Vertical field of view in degrees, centered on the horizon.
+            max_range (float):       Maximum range in meters; beams without return report `max_range`.
+            offset (tuple):          Position of the sensor relative to the drone's body.
+        """
+        self._world = world
+        self._max_range = max_range
+        self._offset = np.array(offset, dtype=np.float32)
+        self._shape = (vertical_beams, horizontal_beams)
+
+        # Beam directions in the body frame of shape (vertical_beams * horizontal_beams, 3)
+        azimuths = np.arange(horizontal_beams) * (2 * np.pi / horizontal_beams)
+        elevations = np.radians(np.linspace(-vertical_fov / 2, vertical_fov / 2, vertical_beams))
+        elevations, azimuths = np.meshgrid(elevations, azimuths, indexing='ij')
+        self._directions = np.stack([
+            np.cos(elevations) * np.cos(azimuths),
+            np.sin(elevations),
+            np.cos(elevations) * np.sin(azimuths)
+        ], axis=-1).reshape(-1, 3).astype(np.float32)
+
+    @property
+    def num_beams(self) -> int:
+        return len(self._directions)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._shape
+
+    @property
+    def max_range(self) -> float:
+        return self._max_range
+
+    @property
+    def directions(self) -> np.ndarray:
+        return self._directions
+
+    def scan(self, positions: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+        """Measures the ranges of all beams of all drones in one batched ray cast.
+
+        Args:
+            positions (np.ndarray): Drone positions of shape (num_drones, 3).
+            rotations (np.ndarray): Drone (x, y, z, w) rotations of shape (num_drones, 4).
+
+        Returns:
+            np.ndarray: Ranges of shape (num_drones, vertical_beams, horizontal_beams).
+        """
+        start = PROFILER.start()
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        rotations = np.asarray(rotations, dtype=np.float32).reshape(-1, 4)
+
+        origins = positions + rotate_vectors(rotations, self._offset[np.newaxis])[:, 0]
+        directions = rotate_vectors(rotations, self._directions)
+        origins = np.broadcast_to(origins[:, np.newaxis], directions.shape)
+
+        ranges, _ = self._world.cast_rays(origins.reshape(-1, 3), directions.reshape(-1, 3), max_range=self._max_range)
+        ranges = np.minimum(ranges, self._max_range)
+        PROFILER.stop('sensors.lidar', start)
+        return ranges.reshape(len(positions), *self._shape)
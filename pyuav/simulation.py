@@ -0,0 +1,172 @@
+import numpy as np
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from pyuav.graphics.rendering import Scene, PerspectiveCamera, Renderer
+    from pyuav.trajectory import TrajectoryWriter
+
+
+class Simulation:
+    def __init__(
+            self,
+            scene: 'Scene',
+            renderer: 'Renderer',
+            camera: 'PerspectiveCamera',
+            physics_hz: float = 240.0,
+            render_hz: float = 30.0,
+            interpolate: bool = False,
+            return_buffer: bool = True,
+            trajectory: 'TrajectoryWriter' = None
+            ) -> None:
+        """Simulation loop stepping physics at a fixed rate, decoupled from the (lower) rate at which frames are rendered.
+
+        Args:
+            scene (Scene):              Scene containing all entities.
+            renderer (Renderer):        Renderer used to render frames, e.g. `RENDERERS.create('pygfx', width=640, height=480)`.
+            camera (PerspectiveCamera): Camera used for rendering.
+            physics_hz (float):         Number of physics steps per simulated second.
+            render_hz (float):          Number of rendered frames per simulated second.
+            interpolate (bool):         Whether to interpolate entity poses between the last two physics steps when rendering
+                                        (smooth motion at the cost of one physics step of latency).
+            return_buffer (bool):       Whether to return the raw frame buffer (see `Renderer.render`).
+            trajectory (TrajectoryWriter, optional): Log to which the poses and setpoints of all entities are written
+                                        after every physics step (see `Replay`).
+        """
+        assert physics_hz > 0 and render_hz > 0, 'Physics and render rates must be positive'
+        self._scene = scene
+        self._renderer = renderer
+        self._camera = camera
+        self._physics_dt = 1.0 / physics_hz
+        self._render_dt = 1.0 / render_hz
+        self._interpolate = interpolate
+        self._return_buffer = return_buffer
+        self._trajectory = trajectory
+
+        self._entities = []
+        self._time = 0.0
+        self._accumulator = 0.0
+        self._num_steps = 0
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def num_steps(self) -> int:
+        return self._num_steps
+
+    @property
+    def physics_dt(self) -> float:
+        return self._physics_dt
+
+    @property
+    def render_dt(self) -> float:
+        return self._render_dt
+
+    @property
+    def scene(self) -> 'Scene':
+        return self._scene
+
+    @property
+    def camera(self) -> 'PerspectiveCamera':
+        return self._camera
+
+    @camera.setter
+    def camera(self, camera: 'PerspectiveCamera') -> None:
+        self._camera = camera
+
+    def add(self, entity: object, controller: Callable[[float], tuple[Iterable, Iterable]]) -> None:
+        """Adds a controllable entity (e.g. `Quadcopter` or `Swarm`) to the simulation.
+
+        Args:
+            entity (object):       Entity implementing `control(target(s), heading(s), dt)`, `get_pose()` and `set_pose()`.
+            controller (Callable): Function mapping simulation time to the entity's target(s) and heading(s).
+        """
+        position, rotation = entity.get_pose()
+        self._entities.append(dict(
+            entity=entity,
+            controller=controller,
+            prev_pose=(np.copy(position), np.copy(rotation)),
+            pose=(np.copy(position), np.copy(rotation))
+            ))
+
+    def step(self) -> None:
+        """Advances physics of all entities by a single fixed time step.
+        """
+        setpoints = []
+        for item in self._entities:
+            item['prev_pose'] = item['pose']
+
+            targets, headings = item['controller'](self._time)
+            item['entity'].control(targets, headings, dt=self._physics_dt)
+            setpoints.append((targets, headings))
+
+            position, rotation = item['entity'].get_pose()
+            item['pose'] = (np.copy(position), np.copy(rotation))
+
+        self._time += self._physics_dt
+        self._num_steps += 1
+
+        if self._trajectory is not None:
+            self._trajectory.write(
+                time=self._time,
+                positions=np.concatenate([np.reshape(item['pose'][0], (-1, 3)) for item in self._entities]),
+                rotations=np.concatenate([np.reshape(item['pose'][1], (-1, 4)) for item in self._entities]),
+                targets=np.concatenate([np.reshape(targets, (-1, 3)) for targets, _ in setpoints]),
+                headings=np.concatenate([np.reshape(headings, -1) for _, headings in setpoints])
+                )
+
+    def advance(self, duration: float) -> int:
+        """Advances physics by `duration` seconds of simulated time using fixed substeps;
+        remaining time smaller than one step is carried over to the next call.
+
+        Args:
+            duration (float): Simulated time in seconds.
+
+        Returns:
+            int: Number of physics steps taken.
+        """
+        self._accumulator += duration
+        num_steps = int(self._accumulator / self._physics_dt + 1e-9)
+        for _ in range(num_steps):
+            self.step()
+        self._accumulator = max(self._accumulator - num_steps * self._physics_dt, 0.0)
+        return num_steps
+
+    def render(self) -> np.ndarray:
+        """Renders current state of the scene (interpolating entity poses if enabled).
+        """
+        if self._interpolate:
+            alpha = self._accumulator / self._physics_dt
+            for item in self._entities:
+                (prev_pos, prev_rot), (pos, rot) = item['prev_pose'], item['pose']
+
+                # Normalized linear interpolation of rotations (along shortest arc)
+                sign = np.where(np.sum(prev_rot * rot, axis=-1, keepdims=True) < 0, -1.0, 1.0)
+                rotation = (1 - alpha) * prev_rot + alpha * sign * rot
+                rotation = rotation / np.linalg.norm(rotation, axis=-1, keepdims=True)
+
+                item['entity'].set_pose((1 - alpha) * prev_pos + alpha * pos, rotation)
+
+        return self._renderer.render(self._scene, self._camera, return_buffer=self._return_buffer)
+
+    def step_frame(self) -> np.ndarray:
+        """Advances simulation by one render period and renders a frame.
+
+        Returns:
+            np.ndarray: Rendered frame (see `Renderer.render`).
+        """
+        self.advance(self._render_dt)
+        return self.render()
+
+    def run(self, num_frames: int, callback: Callable[[np.ndarray], None] = None) -> None:
+        """Runs simulation for a number of rendered frames.
+
+        Args:
+            num_frames (int):               Number of frames to render.
+            callback (Callable, optional):  Function called with each rendered frame.
+        """
+        for _ in range(num_frames):
+            frame = self.step_frame()
+            if callback is not None:
+                callback(frame)
@@ -0,0 +1,210 @@
+import os
+import json
+import struct
+import numpy as np
+from typing import Callable, Iterable
+from pyuav.profiling import LOGGER
+
+# Binary trajectory log: magic, format version and header length, followed by a JSON header and fixed-size step records
+TRAJECTORY_MAGIC = b'PYUAVTRJ'
+TRAJECTORY_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def trajectory_dtype(num_drones: int) -> np.dtype:
+    """Returns the (structured) dtype of a single step record for `num_drones` drones.
+    """
+    return np.dtype([
+        ('time', '<f8'),
+        ('positions', '<f4', (num_drones, 3)),
+        ('rotations', '<f4', (num_drones, 4)),
+        ('targets', '<f4', (num_drones, 3)),
+        ('headings', '<f4', (num_drones,))
+    ])
+
+
+class TrajectoryWriter:
+    def __init__(self, file_path: str, seed: int = None, buffer_size: int = 256, **metadata) -> None:
+        """Writes per-step positions, rotations and setpoints (targets and headings) of all drones to a compact
+        binary log. The number of drones is fixed by the first step written.
+
+        Args:
+            file_path (str):      Path of log file to write.
+            seed (int, optional): Seed the run was simulated with (stored in the header for reference).
+            buffer_size (int):    Number of steps buffered in memory before they are written to disk.
+            metadata:             Additional JSON-serializable values to store in the header (e.g. `dt`).
+        """
+        self._file = open(file_path, 'wb')
+        self._header = dict(metadata, seed=seed)
+        self._buffer_size = buffer_size
+        self._buffer = None
+        self._fill = 0
+        self._num_steps = 0
+
+    @property
+    def num_steps(self) -> int:
+        return self._num_steps
+
+    def write(self, time: float, positions: np.ndarray, rotations: np.ndarray, targets: np.ndarray, headings: np.ndarray) -> None:
+        """Appends a step to the log.
+
+        Args:
+            time (float):           Simulated time of the step.
+            positions (np.ndarray): Drone positions of shape (num_drones, 3).
+            rotations (np.ndarray): Drone rotations of shape (num_drones, 4).
+            targets (np.ndarray):   Drone targets of shape (num_drones, 3).
+            headings (np.ndarray):  Drone headings of shape (num_drones,).
+        """
+        if self._buffer is None:
+            self._open(len(np.reshape(positions, (-1, 3))))
+
+        record = self._buffer[self._fill]
+        record['time'] = time
+        record['positions'] = np.reshape(positions, (-1, 3))
+        record['rotations'] = np.reshape(rotations, (-1, 4))
+        record['targets'] = np.reshape(targets, (-1, 3))
+        record['headings'] = np.reshape(headings, -1)
+        self._fill += 1
+        self._num_steps += 1
+
+        if self._fill == self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._fill:
+            self._file.write(self._buffer[:self._fill].tobytes())
+            self._fill = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self._buffer is None:
+            self._open(0)
+        self.flush()
+        self._file.close()
+        LOGGER.info(f'TrajectoryWriter.close() :: wrote {self._num_steps} steps')
+
+    def __enter__(self) -> 'TrajectoryWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _open(self, num_drones: int) -> None:
+        header = json.dumps(dict(self._header, num_drones=num_drones)).encode()
+        self._file.write(_PREAMBLE.pack(TRAJECTORY_MAGIC, TRAJECTORY_FORMAT_VERSION, len(header)) + header)
+        self._buffer = np.zeros(self._buffer_size, dtype=trajectory_dtype(num_drones))
+
+
+def load_trajectory(file_path: str) -> tuple[dict, np.ndarray]:
+    """Loads a trajectory log as a memory-mapped array of step records.
+
+    Args:
+        file_path (str): Path of log file.
+
+    Returns:
+        tuple[dict, np.ndarray]: Header and records of shape (num_steps,) with fields 'time', 'positions',
+                                 'rotations', 'targets' and 'headings'.
+    """
+    with open(file_path, 'rb') as f:
+        magic, version, header_size = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != TRAJECTORY_MAGIC or version != TRAJECTORY_FORMAT_VERSION:
+            raise Exception(f"'{file_path}' is not a trajectory log (version {TRAJECTORY_FORMAT_VERSION})")
+        header = json.loads(f.read(header_size))
+
+    dtype = trajectory_dtype(header['num_drones'])
+    offset = _PREAMBLE.size + header_size
+    num_steps = (os.path.getsize(file_path) - offset) // dtype.itemsize
+    if num_steps == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=(num_steps,))
+
+
+def frame_steps(times: np.ndarray, render_hz: float = None) -> np.ndarray:
+    """Returns the steps to render at a frame rate of `render_hz` (the last step at or before each frame's time),
+    or all steps if None.
+
+    Args:
+        times (np.ndarray):          Simulated times of logged steps of shape (num_steps,).
+        render_hz (float, optional): Frame rate to render at.
+    """
+    if render_hz is None or not len(times):
+        return np.arange(len(times))
+    frame_times = np.arange(times[0], times[-1] + 1e-9, 1.0 / render_hz)
+    return np.searchsorted(times, frame_times + 1e-9, side='right') - 1
+
+
+class Replay:
+    def __init__(self, file_path: str, entities: Iterable[object]) -> None:
+        """Plays back a trajectory log by setting the poses of entities, without running physics.
+
+        Args:
+            file_path (str):     Path of log file.
+            entities (Iterable): Entities to pose, in the order their drones were logged (e.g. the order they were added
+                                 to the `Simulation`). `Swarm`s consume `num_drones` drones, other entities (e.g.
+                                 `Quadcopter` or `Mesh`) a single drone.
+        """
+        self._header, self._records = load_trajectory(file_path)
+        self._entities = list(entities)
+
+        # Range of drones in the log belonging to each entity
+        self._slices, start = [], 0
+        for entity in self._entities:
+            count = getattr(entity, 'num_drones', 1)
+            self._slices.append(slice(start, start + count))
+            start += count
+        assert start == self._header['num_drones'], f"Entities have {start} drones, but the log has {self._header['num_drones']}"
+
+    @property
+    def header(self) -> dict:
+        return self._header
+
+    @property
+    def num_steps(self) -> int:
+        return len(self._records)
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._records['time']
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def apply(self, step: int) -> None:
+        """Sets the poses of all entities to those logged at `step`, and the simulated time of entities with
+        spinning rotors (`set_time`).
+        """
+        record = self._records[step]
+        time = float(record['time'])
+        for entity, drones in zip(self._entities, self._slices):
+            if hasattr(entity, 'set_time'):
+                entity.set_time(time)
+            positions, rotations = record['positions'][drones], record['rotations'][drones]
+            if hasattr(entity, 'num_drones'):
+                entity.set_pose(positions, rotations)
+            elif hasattr(entity, 'set_pose'):
+                entity.set_pose(positions[0], rotations[0])
+            else:
+                entity.set_position(positions[0])
+                entity.set_rotation(rotations[0])
+
+    def frame_steps(self, render_hz: float = None) -> np.ndarray:
+        """Returns the steps to render at a frame rate of `render_hz` (the last step at or before each frame's time),
+        or all steps if None.
+        """
+        return frame_steps(self.times, render_hz)
+
+    def run(self, render: Callable[[], np.ndarray], render_hz: float = None, callback: Callable[[np.ndarray], None] = None) -> None:
+        """Replays the log, rendering a frame at each step (or at `render_hz` frames per simulated second).
+
+        Args:
+            render (Callable):             Function rendering the scene, e.g. `lambda: renderer.render(scene, camera)`.
+            render_hz (float, optional):   Frame rate to render at (default: every logged step).
+            callback (Callable, optional): Function called with each rendered frame.
+        """
+        for step in self.frame_steps(render_hz):
+            self.apply(step)
+            frame = render()
+            if callback is not None:
+                callback(frame)
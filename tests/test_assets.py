@@ -0,0 +1,41 @@
+import os
+import numpy as np
+import imageio.v3 as iio
+from pyuav.graphics.meshes import ASSET_CACHE_SUFFIX, compile_asset, is_compiled, load_asset
+
+
+def _write_image(tmp_path, value: int) -> str:
+    file_path = str(tmp_path / 'image.png')
+    iio.imwrite(file_path, np.full((4, 4, 3), value, dtype=np.uint8))
+    return file_path
+
+
+def test_load_compiles_once(tmp_path):
+    file_path = _write_image(tmp_path, 10)
+    assert not is_compiled(file_path)
+    image = load_asset(file_path)['image']
+    assert isinstance(image, np.memmap)
+    assert image.shape == (4, 4, 4) and image[0, 0, 0] == 10
+    assert is_compiled(file_path)
+    assert sorted(os.listdir(tmp_path)) == ['image.png', 'image.png' + ASSET_CACHE_SUFFIX]
+
+
+def test_partially_written_meta_is_not_compiled(tmp_path):
+    file_path = _write_image(tmp_path, 10)
+    cache_dir = compile_asset(file_path)
+    with open(os.path.join(cache_dir, 'meta.json'), 'w') as f:
+        f.write('{"version": ')
+    assert not is_compiled(file_path)
+    assert load_asset(file_path)['image'][0, 0, 0] == 10
+
+
+def test_recompiling_keeps_mapped_arrays_intact(tmp_path):
+    file_path = _write_image(tmp_path, 10)
+    mapped = load_asset(file_path)['image']
+
+    # Source changes while the old cache is memory-mapped
+    os.remove(file_path)
+    file_path = _write_image(tmp_path, 20)
+    os.utime(file_path, (0, 0))
+    assert load_asset(file_path)['image'][0, 0, 0] == 20
+    assert mapped[0, 0, 0] == 10 and mapped.sum() == mapped[0, 0].sum() * 16
@@ -0,0 +1,104 @@
+import warnings
+import numpy as np
+import pytest
+from pyuav.collision import TriangleBVH, closest_points_on_triangles, find_sphere_pairs, intersect_triangles
+
+
+def _triangle_soup(rng: np.random.Generator, count: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    centers = rng.uniform(-5, 5, size=(count, 1, 3))
+    vertices = (centers + rng.uniform(-0.5, 0.5, size=(count, 3, 3))).reshape(-1, 3).astype(np.float32)
+    return vertices, np.arange(len(vertices)).reshape(-1, 3)
+
+
+def _brute_force(origins, directions, corners, max_range):
+    distances = np.full(len(origins), np.inf, dtype=np.float32)
+    triangles = np.full(len(origins), -1, dtype=np.int64)
+    for i, (a, b, c) in enumerate(corners):
+        t = intersect_triangles(origins, directions, *(np.broadcast_to(x, origins.shape) for x in (a, b, c)))
+        closer = (t < distances) & (t <= max_range)
+        distances[closer] = t[closer]
+        triangles[closer] = i
+    return distances, triangles
+
+
+@pytest.mark.parametrize('max_range', [np.inf, 3.0])
+def test_cast_rays_matches_brute_force(max_range):
+    rng = np.random.default_rng(0)
+    vertices, triangles = _triangle_soup(rng)
+
+    origins = rng.uniform(-6, 6, size=(500, 3)).astype(np.float32)
+    directions = rng.normal(size=(500, 3))
+    directions = (directions / np.linalg.norm(directions, axis=-1, keepdims=True)).astype(np.float32)
+
+    distances, hits = TriangleBVH(vertices, triangles).cast_rays(origins, directions, max_range=max_range)
+    expected_distances, expected_hits = _brute_force(origins, directions, vertices[triangles], max_range)
+
+    assert 0 < np.count_nonzero(expected_hits < 0) < len(origins)
+    assert np.array_equal(hits, expected_hits)
+    assert np.allclose(distances, expected_distances)
+
+
+def test_closest_points_on_triangles_matches_sampling():
+    rng = np.random.default_rng(1)
+    a, b, c = rng.uniform(-1, 1, size=(3, 100, 3))
+    p = rng.uniform(-2, 2, size=(100, 3))
+    closest = closest_points_on_triangles(p, a, b, c)
+
+    # Dense barycentric samples of each triangle
+    u, v = np.meshgrid(np.linspace(0, 1, 101), np.linspace(0, 1, 101))
+    u, v = u[u + v <= 1], v[u + v <= 1]
+    samples = a[:, None] + u[:, None] * (b - a)[:, None] + v[:, None] * (c - a)[:, None]
+    sampled = np.linalg.norm(samples - p[:, None], axis=-1).min(axis=1)
+
+    distances = np.linalg.norm(closest - p, axis=-1)
+    assert np.all(distances <= sampled + 1e-6)
+    assert np.all(sampled - distances < 0.05)
+
+
+def test_query_spheres_matches_brute_force():
+    rng = np.random.default_rng(2)
+    vertices, triangles = _triangle_soup(rng)
+    centers = rng.uniform(-6, 6, size=(300, 3)).astype(np.float32)
+    radius = 0.75
+
+    queries, hits, points, distances = TriangleBVH(vertices, triangles).query_spheres(centers, radius)
+
+    corners = np.broadcast_to(vertices[triangles], (len(centers),) + triangles.shape + (3,)).reshape(-1, 3, 3)
+    p = np.repeat(centers, len(triangles), axis=0)
+    all_distances = np.linalg.norm(closest_points_on_triangles(p, corners[:, 0], corners[:, 1], corners[:, 2]) - p, axis=-1)
+    all_distances = all_distances.reshape(len(centers), len(triangles))
+    expected_queries = np.flatnonzero(all_distances.min(axis=1) <= radius)
+
+    assert 0 < len(expected_queries) < len(centers)
+    assert np.array_equal(queries, expected_queries)
+    assert np.array_equal(hits, all_distances[expected_queries].argmin(axis=1))
+    assert np.allclose(distances, all_distances[expected_queries].min(axis=1), atol=1e-5)
+    assert np.allclose(np.linalg.norm(points - centers[queries], axis=-1), distances, atol=1e-5)
+
+
+@pytest.mark.parametrize('count', [0, 1, 500])
+def test_find_sphere_pairs_matches_brute_force(count):
+    rng = np.random.default_rng(3)
+    centers = rng.uniform(-10, 10, size=(count, 3)).astype(np.float32)
+    radius = 0.8
+
+    i, j = find_sphere_pairs(centers, radius)
+    found = sorted(zip(i.tolist(), j.tolist()))
+
+    distances = np.linalg.norm(centers[:, None] - centers[None], axis=-1)
+    expected_i, expected_j = np.nonzero(np.triu(distances <= 2 * radius, k=1))
+    assert found == sorted(zip(expected_i.tolist(), expected_j.tolist()))
+    assert count < 500 or len(found) > 0
+
+
+def test_rays_parallel_to_triangles_do_not_warn():
+    # Rays parallel to a face (as a lidar's horizontal beams above a cube's top face) have a zero determinant
+    a = np.array([[0, 0, 0], [0, 0, 0]], dtype=np.float32)
+    b = np.array([[1, 0, 0], [1, 0, 0]], dtype=np.float32)
+    c = np.array([[0, 1, 0], [0, 1, 0]], dtype=np.float32)
+    origins = np.array([[2, 2, 1], [0.2, 0.2, 1]], dtype=np.float32)
+    directions = np.array([[0.3, -1, 0], [0, 0, -1]], dtype=np.float32)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        t = intersect_triangles(origins, directions, a, b, c)
+    assert t[0] == np.inf and t[1] == pytest.approx(1.0)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from pyuav.dynamics.quadcopter_primitive import QuadcopterPhysicsClient
+
+
+def _fly_one_second(physics_hz: int) -> tuple[float, np.ndarray]:
+    client = QuadcopterPhysicsClient(seed=0)
+    for _ in range(physics_hz):
+        client.control_all([[20, 5, 10]], [0.0], dt=1.0 / physics_hz)
+    return float(np.linalg.norm(client.velocities[0])), client.positions[0].copy()
+
+
+@pytest.mark.parametrize('physics_hz', [30, 240])
+def test_speed_after_one_second_does_not_depend_on_physics_rate(physics_hz):
+    reference_speed, reference_position = _fly_one_second(20) # dt = 0.05
+    speed, position = _fly_one_second(physics_hz)
+    assert speed == pytest.approx(reference_speed, rel=0.05)
+    assert np.allclose(position, reference_position, atol=0.01)
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import pytest
+from pyuav.envs import QuadcopterVecEnv
+
+
+def test_state_observations_match_space():
+    env = QuadcopterVecEnv(num_envs=3, seed=0)
+    observations, _ = env.reset(seed=0)
+    assert env.observation_space.contains(observations)
+
+    observations, rewards, terminations, truncations, _ = env.step(env.action_space.sample())
+    assert env.observation_space.contains(observations)
+    assert rewards.shape == terminations.shape == truncations.shape == (3,)
+
+
+def test_image_observations_match_space():
+    pytest.importorskip('wgpu.gui.offscreen')
+    from pyuav.entities import MODEL_FILEPATH, TEXTURE_FILEPATH, ROTOR_FILEPATH
+    if not all(map(os.path.isfile, (MODEL_FILEPATH, TEXTURE_FILEPATH, ROTOR_FILEPATH))):
+        pytest.skip('Drone assets not available')
+
+    env = QuadcopterVecEnv(num_envs=2, image_size=(64, 48), render_mode='rgb_array', seed=0)
+    observations, _ = env.reset(seed=0)
+    assert observations['image'].shape == (2, 48, 64, 3)
+    assert env.observation_space.contains(observations)
+
+    observations, *_ = env.step(env.action_space.sample())
+    assert env.observation_space.contains(observations)
+    assert env.render().shape == (48, 64, 3)
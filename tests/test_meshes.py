@@ -0,0 +1,32 @@
+import gc
+import pygfx as gfx
+from pyuav.graphics.meshes import instance_id_lut, register_instance_id, unregister_instance_id
+
+
+def _lookup(pick_ids: list[int]) -> list[int]:
+    lut = instance_id_lut()
+    return [int(lut[i]) if i < len(lut) else 0 for i in pick_ids]
+
+
+def test_instances_of_instanced_meshes_are_mapped():
+    obj = gfx.InstancedMesh(gfx.box_geometry(), gfx.MeshBasicMaterial(), count=3)
+    instance_id = register_instance_id(obj)
+    pick_ids = obj.instance_buffer.data['global_id'].tolist()
+    assert _lookup(pick_ids) == [instance_id] * 3
+
+
+def test_released_objects_are_unmapped():
+    obj = gfx.Mesh(gfx.box_geometry(), gfx.MeshBasicMaterial())
+    instance_id = register_instance_id(obj)
+    assert _lookup([obj.id]) == [instance_id]
+    unregister_instance_id(obj)
+    assert _lookup([obj.id]) == [0]
+
+
+def test_collected_objects_are_unmapped():
+    obj = gfx.Mesh(gfx.box_geometry(), gfx.MeshBasicMaterial())
+    pick_id = obj.id
+    register_instance_id(obj)
+    del obj
+    gc.collect()
+    assert _lookup([pick_id]) == [0]
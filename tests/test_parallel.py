@@ -0,0 +1,19 @@
+import time
+import numpy as np
+import pytest
+from pyuav.parallel import ParallelRunner
+
+
+def _failing_env(rank: int) -> object:
+    raise ValueError(f'environment {rank} could not be created')
+
+
+def test_runner_fails_when_worker_dies():
+    runner = ParallelRunner(_failing_env, num_workers=2, num_drones=1)
+    try:
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError, match='worker 0'):
+            runner.step(np.zeros((2, 1, 3)), np.zeros((2, 1)))
+        assert time.perf_counter() - start < 30
+    finally:
+        runner.close()
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from pyuav.recording import Recorder, load_dataset
+
+
+def test_dataset_round_trip(tmp_path):
+    positions = np.random.default_rng(0).random((5, 2, 3), dtype=np.float32)
+    with Recorder(dataset_dir=str(tmp_path), chunk_size=2, policy='block') as recorder:
+        for step in positions:
+            recorder.record(positions=step)
+    chunks = load_dataset(str(tmp_path), 'positions')
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert np.array_equal(np.concatenate(chunks), positions)
+
+
+def test_close_raises_write_error(tmp_path):
+    # Dataset directory is an existing file, so the writer thread fails
+    path = tmp_path / 'file'
+    path.write_text('')
+    recorder = Recorder(dataset_dir=str(path), policy='block')
+    recorder.record(positions=np.zeros((1, 3)))
+    with pytest.raises(RuntimeError):
+        recorder.close()
@@ -0,0 +1,72 @@
+import functools
+import numpy as np
+import pytest
+
+pytest.importorskip('wgpu.gui.offscreen')
+from pyuav.parallel import render_trajectory
+from pyuav.trajectory import TrajectoryWriter
+
+WIDTH, HEIGHT = 64, 48
+CUBE_OBJ = """v -1 -1 -1
+v 1 -1 -1
+v 1 1 -1
+v -1 1 -1
+v -1 -1 1
+v 1 -1 1
+v 1 1 1
+v -1 1 1
+f 1 3 2
+f 1 4 3
+f 5 6 7
+f 5 7 8
+f 1 2 6
+f 1 6 5
+f 4 7 3
+f 4 8 7
+f 1 5 8
+f 1 8 4
+f 2 3 7
+f 2 7 6
+"""
+
+
+def _build_scene(obj_path: str) -> tuple[object, list]:
+    from pyuav.graphics.lighting import AmbientLight
+    from pyuav.graphics.meshes import Mesh, Material
+    from pyuav.graphics.rendering import Scene
+
+    cube = Mesh(file_path=obj_path, material=Material(diffuse='#ff0000'))
+    return Scene(AmbientLight(), cube), [cube]
+
+
+@pytest.fixture
+def trajectory(tmp_path) -> tuple[str, functools.partial]:
+    obj_path = tmp_path / 'cube.obj'
+    obj_path.write_text(CUBE_OBJ)
+
+    # Cube moving from the left to the right edge of the view
+    file_path = str(tmp_path / 'log.bin')
+    with TrajectoryWriter(file_path) as writer:
+        for step, x in enumerate(np.linspace(-3, 3, 4)):
+            writer.write(step * 0.1, [[x, 0, 0]], [[0, 0, 0, 1]], [[0, 0, 0]], [0])
+    return file_path, functools.partial(_build_scene, str(obj_path))
+
+
+@pytest.mark.parametrize('num_cameras', [1, 2])
+def test_render_trajectory(tmp_path, trajectory, num_cameras):
+    file_path, scene_fn = trajectory
+    cameras = [((0, 0, 10), (0, 0, 0))] * num_cameras
+    output_dir = str(tmp_path / 'frames')
+
+    frames = render_trajectory(file_path, scene_fn, cameras, output_dir, width=WIDTH, height=HEIGHT, num_workers=1, chunk_size=3)
+    assert frames.shape == (4, num_cameras, HEIGHT, WIDTH, 3)
+
+    # Red cube is drawn and moves to the right
+    red = (frames[..., 0] > 40) & (frames[..., 1] < 20)
+    columns = [np.flatnonzero(red[i, 0].any(axis=0)).mean() for i in range(4)]
+    assert red.any(axis=(2, 3)).all()
+    assert np.all(np.diff(columns) > 0)
+
+    # Completed runs are resumed without rendering again
+    resumed = render_trajectory(file_path, scene_fn, cameras, output_dir, width=WIDTH, height=HEIGHT, num_workers=1, chunk_size=3)
+    assert np.array_equal(resumed, frames)
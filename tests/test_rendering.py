@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('wgpu.gui.offscreen')
+from pyuav.graphics.lighting import AmbientLight
+from pyuav.graphics.rendering import Renderer, Scene, PerspectiveCamera, Grid
+
+WIDTH, HEIGHT = 64, 48
+
+
+@pytest.fixture(scope='module')
+def view() -> tuple[Scene, PerspectiveCamera]:
+    camera = PerspectiveCamera(position=(5, 5, 5))
+    camera.set_lookat((0, 0, 0))
+    return Scene(Grid(), AmbientLight()), camera
+
+
+def test_readback_paths_match_frame_buffer(view):
+    scene, camera = view
+    renderer = Renderer(width=WIDTH, height=HEIGHT)
+    assert renderer.render(scene, camera).shape == (HEIGHT, WIDTH, 4)
+
+    buffer = renderer.render(scene, camera, return_buffer=True)
+    assert buffer.shape == (HEIGHT, WIDTH, 4)
+    assert np.array_equal(renderer.render(scene, camera, pixel_format='rgba'), buffer)
+    assert np.array_equal(renderer.render(scene, camera, outputs=('rgb',))['rgb'], buffer)
+    assert np.array_equal(renderer.render_many(scene, [camera])[0], buffer)
+    assert renderer.render_many(scene, [camera, camera, camera]).shape == (3, HEIGHT, WIDTH, 4)
+
+    pipelined = Renderer(width=WIDTH, height=HEIGHT, pipeline_depth=2)
+    pipelined.render(scene, camera)
+    assert np.array_equal(pipelined.render(scene, camera), buffer)
+
+
+@pytest.mark.parametrize('pixel_format, channels', [('bgr', [2, 1, 0]), ('rgb', [0, 1, 2]), ('rgba', [0, 1, 2, 3])])
+def test_render_into_preallocated_frames(view, pixel_format, channels):
+    scene, camera = view
+    renderer = Renderer(width=WIDTH, height=HEIGHT)
+    buffer = renderer.render(scene, camera, return_buffer=True)
+
+    frame = np.empty((HEIGHT, WIDTH, len(channels)), dtype=np.uint8)
+    assert renderer.render(scene, camera, out=frame, pixel_format=pixel_format) is frame
+    assert np.array_equal(frame, buffer[..., channels])
+
+    frames = np.empty((2, HEIGHT, WIDTH, len(channels)), dtype=np.uint8)
+    assert renderer.render_many(scene, [camera, camera], out=frames, pixel_format=pixel_format) is frames
+
+    with pytest.raises(AssertionError, match='Output buffer'):
+        renderer.render(scene, camera, out=np.empty((WIDTH, HEIGHT, len(channels)), dtype=np.uint8), pixel_format=pixel_format)
@@ -0,0 +1,44 @@
+import numpy as np
+from pyuav.trajectory import Replay, TrajectoryWriter, load_trajectory
+
+
+class _Entity:
+    """Stand-in for a `Quadcopter` recording the poses and times it is set to.
+    """
+    def __init__(self) -> None:
+        self.poses, self.times = [], []
+
+    def set_pose(self, position: np.ndarray, rotation: np.ndarray) -> None:
+        self.poses.append((np.array(position), np.array(rotation)))
+
+    def set_time(self, time: float) -> None:
+        self.times.append(time)
+
+
+def _write_log(file_path: str, num_steps: int = 5, num_drones: int = 2) -> np.ndarray:
+    positions = np.random.default_rng(0).random((num_steps, num_drones, 3), dtype=np.float32)
+    rotations = np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (num_drones, 1))
+    with TrajectoryWriter(file_path, seed=0, buffer_size=2, dt=0.1) as writer:
+        for step in range(num_steps):
+            writer.write(0.1 * step, positions[step], rotations, positions[step], np.zeros(num_drones))
+    return positions
+
+
+def test_log_round_trip(tmp_path):
+    file_path = str(tmp_path / 'log.bin')
+    positions = _write_log(file_path)
+    header, records = load_trajectory(file_path)
+    assert header['num_drones'] == 2 and header['dt'] == 0.1
+    assert np.array_equal(records['positions'], positions)
+
+
+def test_replay_sets_poses_and_time(tmp_path):
+    file_path = str(tmp_path / 'log.bin')
+    positions = _write_log(file_path)
+    entities = [_Entity(), _Entity()]
+    replay = Replay(file_path, entities)
+
+    replay.apply(3)
+    for index, entity in enumerate(entities):
+        assert np.array_equal(entity.poses[-1][0], positions[3, index])
+        assert entity.times == [replay.times[3]]
@@ -0,0 +1,33 @@
+import numpy as np
+import pygfx as gfx
+from pyuav.graphics.datatypes import GfxObject
+from pyuav.graphics.transforms import TransformStore
+
+
+class _Object(GfxObject):
+    def __init__(self) -> None:
+        self._instance = gfx.WorldObject()
+
+
+def test_flush_writes_dirty_poses_only():
+    store = TransformStore(capacity=1)
+    objects = [_Object() for _ in range(3)]
+    handles = np.array([store.add(obj) for obj in objects])
+
+    store.set_positions(handles[1], (1, 2, 3))
+    assert store.flush() == 1
+    assert np.allclose(objects[1].get_instance().local.position, (1, 2, 3))
+    assert np.allclose(objects[2].get_instance().local.position, (0, 0, 0))
+    assert store.flush() == 0
+
+
+def test_removed_slots_are_reused_once():
+    store = TransformStore()
+    handles = [store.add(_Object()) for _ in range(2)]
+    store.remove(handles[0])
+    store.remove(handles[0])
+    assert len(store) == 1
+
+    assert store.add(_Object()) == handles[0]
+    assert store.add(_Object()) == 2
+    assert len(store) == 3